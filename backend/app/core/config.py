@@ -78,6 +78,8 @@ class Settings(BaseSettings):
     OPENROUTE_BASE_URL: str = "https://api.openrouteservice.org"
     ROUTING_TIMEOUT: int = 10  # seconds
     ROUTING_MAX_RETRIES: int = 2
+    ROUTING_CACHE_TTL: int = 3600  # seconds (repeat origin/destination queries)
+    ROUTING_CACHE_MAXSIZE: int = 512  # cached ORS responses (least recently used evicted)
     
     # GROUND TRUTH DATA (CWC Flood Gauges)
     CWC_BASE_URL: str = "https://ffs.tamcnhp.com"
@@ -100,6 +102,8 @@ class Settings(BaseSettings):
     XGB_N_ESTIMATORS: int = 200
     XGB_SUBSAMPLE: float = 0.8
     XGB_COLSAMPLE_BYTREE: float = 0.8
+    XGB_DEVICE: str = "auto"  # "auto" (CUDA when available), "cuda" or "cpu"
+    XGB_N_JOBS: int = 0  # CPU hist threads; 0 = min(8, CPU count)
     
     # FEATURE ENGINEERING
     LAG_DAYS: list = [1, 2, 3, 5, 7]
@@ -14,6 +14,7 @@ from contextlib import asynccontextmanager
 from typing import Dict, Any
 
 import shap
+import xgboost as xgb
 from fastapi import FastAPI
 
 from app.core.config import settings
@@ -42,7 +43,7 @@ def load_flood_model() -> Dict[str, Any]:
         return None
     
     with open(model_path, 'rb') as f:
-        model = pickle.load(f)
+        model = pickle.loads(f.read())
     
     logger.info("flood_model_loaded", path=str(model_path))
     
@@ -82,14 +83,19 @@ def load_landslide_model() -> Dict[str, Any]:
     """
     artifacts_dir = Path(settings.ML_ARTIFACTS_DIR) / "landslide"
     
-    # Load model
-    model_path = artifacts_dir / "xgb_model_landslide.pkl"
-    if not model_path.exists():
-        logger.warning("landslide_model_not_found", path=str(model_path))
-        return None
-    
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
+    # Load model (native UBJ; pickles from older training runs still load)
+    model_path = artifacts_dir / "xgb_model_landslide.ubj"
+    if model_path.exists():
+        model = xgb.XGBClassifier()
+        model.load_model(model_path)
+    else:
+        model_path = artifacts_dir / "xgb_model_landslide.pkl"
+        if not model_path.exists():
+            logger.warning("landslide_model_not_found", path=str(model_path.with_suffix(".ubj")))
+            return None
+        
+        with open(model_path, 'rb') as f:
+            model = pickle.loads(f.read())
     
     logger.info("landslide_model_loaded", path=str(model_path))
     
@@ -3,10 +3,18 @@ import sys
 import structlog
 from typing import Any
 
+_LOGGER_CONFIGURED = False
+
 def configure_logger():
     """
     Configure structlog for JSON output and standard logging bridge.
+
+    Idempotent: repeat calls (e.g. from every collected test module) are no-ops.
     """
+    global _LOGGER_CONFIGURED
+    if _LOGGER_CONFIGURED:
+        return
+
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
@@ -17,6 +25,7 @@ def configure_logger():
         logger_factory=structlog.PrintLoggerFactory(),
         cache_logger_on_first_use=True,
     )
+    _LOGGER_CONFIGURED = True
 
 def get_logger(name: str) -> Any:
     """
@@ -192,8 +192,8 @@ def _fetch_weather_api(
                     logger.warning("no_data_returned", lat=lat, lon=lon)
                     return None
                 
-                # Build DataFrame
-                df_data = {"timestamp": pd.to_datetime(timestamps)}
+                # Build DataFrame (request is made with timezone=UTC, so tag on construction)
+                df_data = {"timestamp": pd.to_datetime(timestamps, utc=True)}
                 
                 for var in variables:
                     values = hourly.get(var, [])
@@ -300,6 +300,9 @@ def fetch_historical_weather(
     
     cached_data = load_from_cache(cache_key)
     if cached_data is not None:
+        # Entries cached before timestamps became UTC-aware hold naive
+        # (UTC) times; tag them so they compare against fresh fetches
+        cached_data['timestamp'] = pd.to_datetime(cached_data['timestamp'], utc=True)
         return cached_data
     
     # Generate sampling points
@@ -398,6 +401,9 @@ def fetch_forecast_weather(
     
     cached_data = load_from_cache(cache_key)
     if cached_data is not None:
+        # Entries cached before timestamps became UTC-aware hold naive
+        # (UTC) times; tag them so they compare against fresh fetches
+        cached_data['timestamp'] = pd.to_datetime(cached_data['timestamp'], utc=True)
         return cached_data
     
     # Generate sampling points
@@ -492,7 +498,7 @@ def sanitize_timeseries(
     Sanitize time series data: handle gaps, interpolate, ensure monotonic time.
     
     Args:
-        df: DataFrame with 'timestamp' column
+        df: DataFrame with 'timestamp' column (UTC-aware timestamps are preserved)
         max_gap_hours: Maximum gap to interpolate (hours)
     
     Returns:
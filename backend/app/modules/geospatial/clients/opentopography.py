@@ -13,8 +13,9 @@ Author: NEXUS-AI Team
 
 import hashlib
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple
+from typing import Set, Tuple
 import requests
 
 from app.core.config import settings
@@ -32,6 +33,10 @@ DATASET_CODES = {
     "SRTMGL1": "SRTMGL1"
 }
 
+# Cached DEM paths already validated in this process; repeat requests for the
+# same bbox skip re-reading the raster as long as the file is still on disk.
+_validated_cache_paths: Set[Path] = set()
+
 
 def fetch_dem(
     min_lat: float,
@@ -106,6 +111,12 @@ def fetch_dem(
     cache_path = cache_dir / f"dem_{dataset_code}_{cache_key}.tif"
     
     # Check cache
+    if cache_path in _validated_cache_paths:
+        if cache_path.exists():
+            logger.info("cache_hit", path=str(cache_path), revalidated=False)
+            return cache_path
+        _validated_cache_paths.discard(cache_path)
+    
     if cache_path.exists():
         logger.info("cache_hit", path=str(cache_path))
         
@@ -115,6 +126,7 @@ def fetch_dem(
         
         if validation["valid"]:
             logger.info("cached_dem_valid", metadata=validation)
+            _validated_cache_paths.add(cache_path)
             return cache_path
         else:
             logger.warning("cached_dem_invalid_redownloading", metadata=validation)
@@ -133,9 +145,11 @@ def fetch_dem(
         raise RuntimeError(f"Downloaded DEM failed validation: {validation}")
     
     logger.info("dem_acquired_successfully", path=str(cache_path), metadata=validation)
+    _validated_cache_paths.add(cache_path)
     return cache_path
 
 
+@lru_cache(maxsize=32)
 def _generate_cache_key(bbox: Tuple[float, float, float, float], dataset: str) -> str:
     """
     Generate deterministic cache key from bbox and dataset.
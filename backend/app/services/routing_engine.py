@@ -17,10 +17,12 @@ Author: NEXUS-AI Team
 """
 
 from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
 import math
+import time
 
 import openrouteservice as ors
 try:
@@ -40,6 +42,40 @@ from app.core.logging import get_logger
 
 logger = get_logger("routing_engine")
 
+# In-process ORS response cache: coordinate tuple -> (fetched_at, response),
+# kept in least-recently-used order. Directions are POST requests, so
+# HTTP-level caching never applies to them.
+_ROUTE_CACHE: OrderedDict[Tuple[Tuple[float, float], ...], Tuple[float, Dict[str, Any]]] = OrderedDict()
+
+
+def _route_cache_get(key: Tuple[Tuple[float, float], ...]) -> Optional[Dict[str, Any]]:
+    """Return a cached ORS response that is still within ROUTING_CACHE_TTL."""
+    cached = _ROUTE_CACHE.get(key)
+    if cached is None:
+        return None
+    if time.monotonic() - cached[0] >= settings.ROUTING_CACHE_TTL:
+        del _ROUTE_CACHE[key]
+        return None
+    _ROUTE_CACHE.move_to_end(key)
+    return cached[1]
+
+
+def _route_cache_put(key: Tuple[Tuple[float, float], ...], response: Dict[str, Any]) -> None:
+    """Cache an ORS response, dropping expired entries and then the least
+    recently used ones beyond ROUTING_CACHE_MAXSIZE."""
+    now = time.monotonic()
+    expired = [
+        k for k, (fetched_at, _) in _ROUTE_CACHE.items()
+        if now - fetched_at >= settings.ROUTING_CACHE_TTL
+    ]
+    for k in expired:
+        del _ROUTE_CACHE[k]
+    
+    _ROUTE_CACHE[key] = (now, response)
+    _ROUTE_CACHE.move_to_end(key)
+    while len(_ROUTE_CACHE) > settings.ROUTING_CACHE_MAXSIZE:
+        _ROUTE_CACHE.popitem(last=False)
+
 
 class RouteStatus(str, Enum):
     """Route status codes."""
@@ -215,14 +251,13 @@ def fetch_ors_route(
         waypoints: Optional intermediate waypoints (lat, lon)
     
     Returns:
-        ORS route response dict
+        ORS route response dict (served from cache for identical
+        queries within settings.ROUTING_CACHE_TTL seconds)
         
     Raises:
         ApiError: If ORS API returns an error
         Timeout: If request times out
     """
-    client = get_ors_client()
-    
     # Build coordinate list: [lon, lat] format for ORS
     coords = [[origin[1], origin[0]]]
     
@@ -232,6 +267,14 @@ def fetch_ors_route(
     
     coords.append([destination[1], destination[0]])
     
+    cache_key = tuple(tuple(c) for c in coords)
+    cached = _route_cache_get(cache_key)
+    if cached is not None:
+        logger.info("ors_route_cache_hit", origin=origin, destination=destination)
+        return cached
+    
+    client = get_ors_client()
+    
     try:
         logger.info(
             "fetching_ors_route",
@@ -251,6 +294,7 @@ def fetch_ors_route(
             units='km'
         )
         
+        _route_cache_put(cache_key, response)
         return response
         
     except Timeout as e:
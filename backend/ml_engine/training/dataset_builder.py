@@ -151,9 +151,9 @@ def build_flood_dataset(
         terrain_features = extract_terrain_features(catchment)
         
         # 5. Join weather and gauge data on timestamp
-        # Ensure timestamps are aligned
-        gauge_df['timestamp'] = pd.to_datetime(gauge_df['timestamp'])
-        weather_df['timestamp'] = pd.to_datetime(weather_df['timestamp'])
+        # Ensure timestamps are aligned (weather is UTC-tagged, gauge data is naive UTC)
+        gauge_df['timestamp'] = pd.to_datetime(gauge_df['timestamp'], utc=True)
+        weather_df['timestamp'] = pd.to_datetime(weather_df['timestamp'], utc=True)
         
         # Merge on timestamp (inner join to ensure alignment)
         merged = pd.merge(
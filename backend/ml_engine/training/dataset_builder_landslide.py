@@ -9,12 +9,13 @@ Creates ML dataset on spatial grid cells (1km × 1km) with:
 Author: NEXUS-AI Team
 """
 
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Iterator
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 import geopandas as gpd
-from shapely.geometry import Point, Polygon
+import shapely
+from numba import njit
 
 from app.core.config import settings
 from app.core.logging import get_logger
@@ -22,19 +23,88 @@ from app.core.logging import get_logger
 logger = get_logger("dataset_builder_landslide")
 
 
+def _format_grid_ids(i_idx: np.ndarray, j_idx: np.ndarray) -> np.ndarray:
+    """Vectorized 'CELL_{i:04d}_{j:04d}' ids for integer cell indices."""
+    grid_ids = np.char.add(
+        np.char.add('CELL_', np.char.zfill(i_idx.astype(str), 4)),
+        np.char.add('_', np.char.zfill(j_idx.astype(str), 4))
+    )
+    return grid_ids.astype(object)
+
+
+@njit(cache=True)
+def _lattice_cell_codes(
+    lons: np.ndarray,
+    lats: np.ndarray,
+    min_lon: float,
+    min_lat: float,
+    max_lon: float,
+    max_lat: float,
+    cell_size_deg: float,
+    num_lons: int,
+    num_lats: int
+) -> np.ndarray:
+    """
+    Lattice code (i * num_lats + j) of the cell holding each point.
+    
+    Cells are half-open, so points on the outer east/north edge (or outside
+    the lattice) get -1.
+    """
+    codes = np.empty(lons.shape[0], dtype=np.int64)
+    for k in range(lons.shape[0]):
+        lon = lons[k]
+        lat = lats[k]
+        if lon < min_lon or lon >= max_lon or lat < min_lat or lat >= max_lat:
+            codes[k] = -1
+            continue
+        # min() guards the outer edge against float drift in the lattice spacing
+        i = min(int(np.floor((lon - min_lon) / cell_size_deg)), num_lons - 1)
+        j = min(int(np.floor((lat - min_lat) / cell_size_deg)), num_lats - 1)
+        codes[k] = i * num_lats + j
+    return codes
+
+
+@njit(cache=True)
+def _count_events(
+    cell_idx: np.ndarray,
+    day_idx: np.ndarray,
+    num_cells: int,
+    num_days: int
+) -> np.ndarray:
+    """
+    Accumulate landslide events into a dense (cell, day) count matrix.
+    
+    Serial on purpose: events are sparse and numba has no atomic add,
+    so a prange scatter would race on shared cells.
+    """
+    counts = np.zeros((num_cells, num_days), dtype=np.int16)
+    for k in range(cell_idx.shape[0]):
+        cell = cell_idx[k]
+        day = day_idx[k]
+        if 0 <= cell < num_cells and 0 <= day < num_days:
+            counts[cell, day] += 1
+    return counts
+
+
 def create_spatial_grid(
     bbox: Tuple[float, float, float, float],
-    cell_size_km: float = 1.0
-) -> gpd.GeoDataFrame:
+    cell_size_km: float = 1.0,
+    with_geometry: bool = True
+) -> pd.DataFrame:
     """
     Create uniform spatial grid over bounding box.
     
     Args:
         bbox: (min_lon, min_lat, max_lon, max_lat)
         cell_size_km: Grid cell size in kilometers
+        with_geometry: Build cell polygons; labelling a regular grid does not
+            need them, so they can be skipped to save GEOS memory
     
     Returns:
-        GeoDataFrame with grid cells and metadata
+        GeoDataFrame with grid cells and metadata (plain DataFrame without
+        the geometry column if ``with_geometry`` is False); the lattice
+        bounds, cell size and shape are recorded in ``attrs['regular_grid']``
+        and each cell's lattice code in the ``lattice_code`` column
     
     Example:
         >>> bbox = (89.0, 24.0, 96.0, 28.0)
@@ -49,31 +119,35 @@ def create_spatial_grid(
     lons = np.arange(min_lon, max_lon, cell_size_deg)
     lats = np.arange(min_lat, max_lat, cell_size_deg)
     
-    cells = []
-    for i, lon in enumerate(lons):
-        for j, lat in enumerate(lats):
-            # Create cell polygon
-            cell_bounds = [
-                (lon, lat),
-                (lon + cell_size_deg, lat),
-                (lon + cell_size_deg, lat + cell_size_deg),
-                (lon, lat + cell_size_deg),
-                (lon, lat)
-            ]
-            polygon = Polygon(cell_bounds)
-            
-            # Cell center
-            center_lon = lon + cell_size_deg / 2
-            center_lat = lat + cell_size_deg / 2
-            
-            cells.append({
-                'grid_id': f'CELL_{i:04d}_{j:04d}',
-                'center_lon': center_lon,
-                'center_lat': center_lat,
-                'geometry': polygon
-            })
-    
-    gdf = gpd.GeoDataFrame(cells, crs="EPSG:4326")
+    # Cell origins, ordered lon-major (CELL_i_j with i over lons, j over lats)
+    lon_grid, lat_grid = np.meshgrid(lons, lats, indexing='ij')
+    cell_lon = lon_grid.ravel()
+    cell_lat = lat_grid.ravel()
+    
+    i_idx, j_idx = np.meshgrid(np.arange(len(lons)), np.arange(len(lats)), indexing='ij')
+    
+    columns = {
+        'grid_id': _format_grid_ids(i_idx.ravel(), j_idx.ravel()),
+        # Integer form of the id (i * num_lats + j), matched against the
+        # lattice codes of the landslides without touching the strings
+        'lattice_code': (i_idx * len(lats) + j_idx).ravel().astype(np.int64),
+        'center_lon': cell_lon + cell_size_deg / 2,
+        'center_lat': cell_lat + cell_size_deg / 2,
+    }
+    
+    if with_geometry:
+        # One box per cell, built in a single vectorized GEOS call
+        polygons = shapely.box(cell_lon, cell_lat, cell_lon + cell_size_deg, cell_lat + cell_size_deg)
+        gdf = gpd.GeoDataFrame(columns, geometry=polygons, crs="EPSG:4326")
+    else:
+        gdf = pd.DataFrame(columns)
+    
+    # Lattice parameters, so point-to-cell assignment can skip the spatial join
+    gdf.attrs['regular_grid'] = {
+        'bounds': (min_lon, min_lat, lons[-1] + cell_size_deg, lats[-1] + cell_size_deg),
+        'cell_size_deg': cell_size_deg,
+        'shape': (len(lons), len(lats))
+    }
     
     logger.info(
         "grid_created",
@@ -86,8 +160,9 @@ def create_spatial_grid(
 
 
 def extract_slope_features_mock(
-    grid: gpd.GeoDataFrame
-) -> gpd.GeoDataFrame:
+    grid: pd.DataFrame,
+    seed: int = 42
+) -> pd.DataFrame:
     """
     Extract slope features for each grid cell (MOCK VERSION).
     
@@ -95,33 +170,160 @@ def extract_slope_features_mock(
     For now, generates realistic synthetic slope/aspect values.
     
     Args:
-        grid: Grid GeoDataFrame
+        grid: Grid from create_spatial_grid
+        seed: Random seed
     
     Returns:
         Grid with slope, aspect, curvature columns
     """
     logger.info("extracting_slope_features_mock", num_cells=len(grid))
     
-    np.random.seed(42)
+    rng = np.random.default_rng(seed)
+    n = len(grid)
     
     # Generate realistic slope values (0-45 degrees, skewed towards lower)
-    grid['slope'] = np.random.beta(2, 5, size=len(grid)) * 45
+    grid['slope'] = (rng.beta(2, 5, size=n) * 45).astype(np.float32)
     
     # Aspect (0-360 degrees)
-    grid['aspect'] = np.random.uniform(0, 360, size=len(grid))
+    grid['aspect'] = rng.random(n, dtype=np.float32) * np.float32(360)
     
     # Curvature (-0.1 to 0.1, mostly near 0)
-    grid['curvature'] = np.random.normal(0, 0.02, size=len(grid))
-    grid['curvature'] = np.clip(grid['curvature'], -0.1, 0.1)
+    curvature = rng.standard_normal(n, dtype=np.float32)
+    curvature *= np.float32(0.02)
+    grid['curvature'] = np.clip(curvature, -0.1, 0.1, out=curvature)
     
     # Elevation (mock: 100-3000m)
-    grid['elevation'] = np.random.uniform(100, 3000, size=len(grid))
+    elevation = rng.random(n, dtype=np.float32)
+    elevation *= np.float32(2900)
+    elevation += np.float32(100)
+    grid['elevation'] = elevation
     
     logger.info("slope_features_extracted_mock", features=['slope', 'aspect', 'curvature', 'elevation'])
     
     return grid
 
 
+def _lattice_row_lookup(
+    grid: pd.DataFrame,
+    num_lons: int,
+    num_lats: int
+) -> Optional[np.ndarray]:
+    """
+    Grid row position of every lattice code (i * num_lats + j).
+    
+    Built from the grid's ``lattice_code`` column rather than assumed from
+    row order, so a filtered or re-sorted grid (whose ``attrs`` survive)
+    still maps each lattice cell to its own row; cells not in the grid map
+    to -1.
+    
+    Returns:
+        Lookup array of length num_lons * num_lats, or None if the grid
+        carries no usable lattice codes
+    """
+    if 'lattice_code' not in grid.columns:
+        return None
+    lattice_code = grid['lattice_code'].to_numpy(dtype=np.int64)
+    if ((lattice_code < 0) | (lattice_code >= num_lons * num_lats)).any():
+        return None
+    
+    lookup = np.full(num_lons * num_lats, -1, dtype=np.int64)
+    lookup[lattice_code] = np.arange(len(grid), dtype=np.int64)
+    return lookup
+
+
+def _locate_landslides(
+    grid: gpd.GeoDataFrame,
+    landslides: pd.DataFrame
+) -> Tuple[np.ndarray, pd.DatetimeIndex]:
+    """
+    Map each landslide to the row position of the grid cell containing it.
+    
+    Landslides outside the grid are dropped.
+    
+    Returns:
+        (cell_idx, event_dates) for the landslides that fall in a cell
+    """
+    regular = grid.attrs.get('regular_grid')
+    row_lookup = None
+    if regular is not None:
+        row_lookup = _lattice_row_lookup(grid, *regular['shape'])
+        if row_lookup is None:
+            regular = None
+    min_lon, min_lat, max_lon, max_lat = regular['bounds'] if regular is not None else grid.total_bounds
+    
+    # Cheap bbox prefilter: landslides outside the grid extent never reach
+    # the cell lookup or GEOS
+    lons = landslides['lon'].to_numpy()
+    lats = landslides['lat'].to_numpy()
+    in_bbox = (lons >= min_lon) & (lons <= max_lon) & (lats >= min_lat) & (lats <= max_lat)
+    lons, lats = lons[in_bbox], lats[in_bbox]
+    event_dates = landslides['date'].to_numpy()[in_bbox]
+    
+    logger.info(
+        "landslides_bbox_filtered",
+        kept=len(lons),
+        dropped=len(landslides) - len(lons),
+        kept_ratio=round(len(lons) / len(landslides), 3) if len(landslides) else 0.0
+    )
+    
+    if regular is not None:
+        # Regular lat/lon lattice: each landslide's cell follows directly from
+        # its offset to the grid origin, no spatial index or predicate needed.
+        # The lattice code goes through the id-based lookup to a row position;
+        # -1 (east/north edge, or a cell not in this grid) is skipped by the counter
+        num_lons, num_lats = regular['shape']
+        codes = _lattice_cell_codes(
+            lons.astype(np.float64), lats.astype(np.float64),
+            min_lon, min_lat, max_lon, max_lat,
+            regular['cell_size_deg'], num_lons, num_lats
+        )
+        cell_idx = np.where(codes >= 0, row_lookup[np.maximum(codes, 0)], -1)
+    else:
+        # Arbitrary grid: bulk point-in-polygon query against an STRtree of the
+        # cells (shapely prepares the tree geometries for the predicate itself)
+        points = shapely.points(lons, lats)
+        tree = shapely.STRtree(grid.geometry.values)
+        
+        # Pairs of (landslide position, grid row position); misses are simply absent
+        event_pos, cell_idx = tree.query(points, predicate='within')
+        event_dates = event_dates[event_pos]
+    
+    return cell_idx.astype(np.int64), pd.to_datetime(event_dates).normalize()
+
+
+def _label_frame(
+    grid: gpd.GeoDataFrame,
+    cell_idx: np.ndarray,
+    event_dates: pd.DatetimeIndex,
+    dates: pd.DatetimeIndex
+) -> pd.DataFrame:
+    """
+    Build the cell-major (cell × day) label frame for one run of dates.
+    
+    Events on days outside ``dates`` are ignored.
+    """
+    # Day offset of each event within the run
+    day_idx = (event_dates - dates[0]).days.to_numpy().astype(np.int64)
+    
+    # Dense (cell, day) event counts; events outside the grid/period are skipped
+    counts = _count_events(cell_idx, day_idx, len(grid), len(dates))
+    
+    # Long form, cell-major like the grid_id × date product. grid_id is
+    # dictionary-encoded on the cell positions, so no per-row strings
+    cell_id = np.repeat(np.arange(len(grid), dtype=np.int32), len(dates))
+    labels_df = pd.DataFrame({
+        'grid_id': pd.Categorical.from_codes(cell_id, categories=pd.Index(grid['grid_id'])),
+        'cell_id': cell_id,
+        'date': np.tile(dates.to_numpy(), len(grid)),
+        'num_events': counts.ravel()
+    })
+    
+    # Create binary label
+    labels_df['label'] = (labels_df['num_events'].to_numpy() > 0).view(np.int8)
+    
+    return labels_df
+
+
 def spatial_join_landslides(
     grid: gpd.GeoDataFrame,
     landslides: pd.DataFrame,
@@ -130,15 +332,19 @@ def spatial_join_landslides(
     """
     Create daily labels for each grid cell based on landslide occurrences.
     
+    Materializes every cell × day row; see ``iter_landslide_labels`` for
+    periods too long to hold at once.
+    
     Args:
         grid: Spatial grid
         landslides: Landslide inventory (lat, lon, date)
         date_range: (start_date, end_date) for daily labels
     
     Returns:
-        DataFrame with columns: grid_id, date, label, num_events
+        DataFrame with columns: grid_id, cell_id, date, num_events, label
     
     Schema:
+        - cell_id = integer row position of the cell in ``grid``
         - label = 1 if ≥1 landslide in cell on that day
         - label = 0 otherwise
     """
@@ -149,40 +355,11 @@ def spatial_join_landslides(
         date_range=f"{date_range[0]} to {date_range[1]}"
     )
     
-    # Convert landslides to GeoDataFrame
-    landslides_gdf = gpd.GeoDataFrame(
-        landslides,
-        geometry=[Point(row['lon'], row['lat']) for _, row in landslides.iterrows()],
-        crs="EPSG:4326"
-    )
-    
-    # Spatial join: which grid cell does each landslide fall into?
-    joined = gpd.sjoin(landslides_gdf, grid[['grid_id', 'geometry']], how='left', predicate='within')
-    
-    # Group by grid_id and date
-    joined['date'] = pd.to_datetime(joined['date']).dt.date
-    landslide_counts = joined.groupby(['grid_id', 'date']).size().reset_index(name='num_events')
+    cell_idx, event_dates = _locate_landslides(grid, landslides)
     
-    # Generate all grid_id × date combinations
     start_date, end_date = date_range
-    dates = pd.date_range(start_date, end_date, freq='D').date
-    
-    all_combinations = []
-    for grid_id in grid['grid_id']:
-        for date in dates:
-            all_combinations.append({'grid_id': grid_id, 'date': date})
-    
-    full_df = pd.DataFrame(all_combinations)
-    
-    # Merge with landslide counts
-    full_df = full_df.merge(landslide_counts, on=['grid_id', 'date'], how='left')
-    full_df['num_events'] = full_df['num_events'].fillna(0).astype(int)
-    
-    # Create binary label
-    full_df['label'] = (full_df['num_events'] > 0).astype(int)
-    
-    # Convert date back to datetime
-    full_df['date'] = pd.to_datetime(full_df['date'])
+    dates = pd.date_range(start_date, end_date, freq='D').normalize()
+    full_df = _label_frame(grid, cell_idx, event_dates, dates)
     
     logger.info(
         "labels_created",
@@ -194,6 +371,46 @@ def spatial_join_landslides(
     return full_df
 
 
+def iter_landslide_labels(
+    grid: gpd.GeoDataFrame,
+    landslides: pd.DataFrame,
+    date_range: Tuple[datetime, datetime],
+    chunk_days: int = 365
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the daily labels of ``spatial_join_landslides`` in date blocks.
+    
+    Landslides are located once; each block is then a cell-major frame
+    covering at most ``chunk_days`` days, so peak memory is bounded by
+    cells × chunk_days rather than the whole period. Callers can write
+    each block out (e.g. one parquet partition per year) before the next.
+    
+    Args:
+        grid: Spatial grid
+        landslides: Landslide inventory (lat, lon, date)
+        date_range: (start_date, end_date) for daily labels
+        chunk_days: Days per block
+    
+    Yields:
+        DataFrames with the same columns as ``spatial_join_landslides``
+    """
+    logger.info(
+        "streaming_landslide_labels",
+        num_cells=len(grid),
+        num_landslides=len(landslides),
+        date_range=f"{date_range[0]} to {date_range[1]}",
+        chunk_days=chunk_days
+    )
+    
+    cell_idx, event_dates = _locate_landslides(grid, landslides)
+    
+    start_date, end_date = date_range
+    dates = pd.date_range(start_date, end_date, freq='D').normalize()
+    
+    for offset in range(0, len(dates), chunk_days):
+        yield _label_frame(grid, cell_idx, event_dates, dates[offset:offset + chunk_days])
+
+
 def apply_negative_sampling(
     df: pd.DataFrame,
     ratio: int = 10,
@@ -216,21 +433,26 @@ def apply_negative_sampling(
     """
     logger.info("applying_negative_sampling", ratio=f"1:{ratio}")
     
-    positives = df[df['label'] == 1]
-    negatives = df[df['label'] == 0]
+    rng = np.random.default_rng(seed)
+    
+    # Work on row positions so only the final selection is materialised
+    labels = df['label'].to_numpy()
+    positive_idx = np.flatnonzero(labels == 1)
+    negative_idx = np.flatnonzero(labels == 0)
     
-    num_positives = len(positives)
+    num_positives = len(positive_idx)
     num_negatives_to_sample = num_positives * ratio
     
-    if num_negatives_to_sample >= len(negatives):
+    if num_negatives_to_sample >= len(negative_idx):
         # Not enough negatives, use all
-        sampled_negatives = negatives
-        logger.warning("insufficient_negatives", requested=num_negatives_to_sample, available=len(negatives))
+        sampled_negative_idx = negative_idx
+        logger.warning("insufficient_negatives", requested=num_negatives_to_sample, available=len(negative_idx))
     else:
-        sampled_negatives = negatives.sample(n=num_negatives_to_sample, random_state=seed)
+        sampled_negative_idx = rng.choice(negative_idx, size=num_negatives_to_sample, replace=False)
     
-    balanced = pd.concat([positives, sampled_negatives], ignore_index=True)
-    balanced = balanced.sample(frac=1, random_state=seed).reset_index(drop=True)
+    # Shuffle positives and sampled negatives together, then gather once
+    balanced_idx = rng.permutation(np.concatenate([positive_idx, sampled_negative_idx]))
+    balanced = df.take(balanced_idx).reset_index(drop=True)
     
     logger.info(
         "negative_sampling_complete",
@@ -248,7 +470,8 @@ def build_landslide_dataset(
     end_date: datetime,
     landslides: pd.DataFrame,
     cell_size_km: float = 1.0,
-    negative_sampling_ratio: int = 10
+    negative_sampling_ratio: int = 10,
+    seed: int = 42
 ) -> pd.DataFrame:
     """
     Build complete landslide ML dataset.
@@ -260,6 +483,7 @@ def build_landslide_dataset(
         landslides: Landslide inventory
         cell_size_km: Grid cell size
         negative_sampling_ratio: Negative:positive ratio
+        seed: Random seed for the mock features and sampling
     
     Returns:
         ML-ready dataset with features and labels
@@ -271,28 +495,39 @@ def build_landslide_dataset(
         landslides=len(landslides)
     )
     
-    # 1. Create spatial grid
-    grid = create_spatial_grid(bbox, cell_size_km)
+    # 1. Create spatial grid (labels come from the lattice, no polygons needed)
+    grid = create_spatial_grid(bbox, cell_size_km, with_geometry=False)
     
     # 2. Extract slope features (mock)
-    grid = extract_slope_features_mock(grid)
+    grid = extract_slope_features_mock(grid, seed=seed)
     
     # 3. Create labels
     labels_df = spatial_join_landslides(grid, landslides, (start_date, end_date))
     
-    # 4. Join grid features
-    grid_features = grid[['grid_id', 'center_lon', 'center_lat', 'slope', 'aspect', 'curvature', 'elevation']]
-    dataset = labels_df.merge(grid_features, on='grid_id', how='left')
+    # 4. Join grid features: cell_id is the grid row, so the join is a gather
+    grid_features = grid[['center_lon', 'center_lat', 'slope', 'aspect', 'curvature', 'elevation']]
+    grid_features = grid_features.take(labels_df['cell_id'].to_numpy()).reset_index(drop=True)
+    dataset = pd.concat([labels_df.drop(columns='cell_id'), grid_features], axis=1)
     
     # 5. Add mock weather data (simplified for Task 9B demo)
     # In production, this would fetch from Open-Meteo API via weather_cache
     logger.info("adding_mock_weather_data")
     
-    dataset['rainfall_mm'] = np.random.exponential(2, size=len(dataset))
-    dataset['temperature'] = np.random.uniform(15, 35, size=len(dataset))
+    # Separate stream from the terrain mock so the two aren't correlated
+    rng = np.random.default_rng(seed + 1)
+    n = len(dataset)
+    
+    rainfall = rng.standard_exponential(n, dtype=np.float32)
+    rainfall *= np.float32(2)
+    dataset['rainfall_mm'] = rainfall
+    
+    temperature = rng.random(n, dtype=np.float32)
+    temperature *= np.float32(20)
+    temperature += np.float32(15)
+    dataset['temperature'] = temperature
     
     # 6. Apply negative sampling
-    dataset = apply_negative_sampling(dataset, ratio=negative_sampling_ratio)
+    dataset = apply_negative_sampling(dataset, ratio=negative_sampling_ratio, seed=seed)
     
     logger.info(
         "dataset_complete",
@@ -10,8 +10,7 @@ from typing import Tuple, Dict, Optional
 import numpy as np
 import pandas as pd
 from sklearn.metrics import (
-    confusion_matrix, precision_score, recall_score, f1_score,
-    roc_auc_score, average_precision_score, fbeta_score
+    confusion_matrix, roc_auc_score, average_precision_score
 )
 import xgboost as xgb
 
@@ -21,11 +20,62 @@ from app.core.logging import get_logger
 logger = get_logger("evaluation")
 
 
+def _to_feature_matrix(X: pd.DataFrame) -> np.ndarray:
+    """
+    Materialize features as a C-contiguous float32 matrix for XGBoost.
+    
+    A DataFrame's columns are stored column-major, so handing it over directly
+    makes XGBoost transpose and upcast it on ingest.
+    """
+    return np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+
+
+def predict_positive_proba(model: xgb.XGBClassifier, X: pd.DataFrame) -> np.ndarray:
+    """
+    Positive-class probabilities for a binary model, scored once.
+    
+    Predicts straight from the booster on the float32 matrix, returning the
+    1-D probability vector rather than the two-column predict_proba matrix.
+    
+    Args:
+        model: Trained binary XGBoost model
+        X: Features to score, with the model's feature columns in training order
+    
+    Returns:
+        float32 array of P(label=1), one per row
+    
+    Raises:
+        ValueError: If X's columns differ from the model's feature names
+    """
+    if not isinstance(model, xgb.XGBModel):
+        return model.predict_proba(_to_feature_matrix(X))[:, 1]
+    
+    # The bare matrix carries no names, so do the check predict_proba would
+    # have made on the frame: same features, same order as in training
+    booster = model.get_booster()
+    if isinstance(X, pd.DataFrame) and booster.feature_names is not None:
+        if list(X.columns) != booster.feature_names:
+            missing = sorted(set(booster.feature_names).difference(X.columns))
+            raise ValueError(
+                f"feature_names mismatch: model expects {len(booster.feature_names)} "
+                f"features in training order (missing: {missing})"
+            )
+    X_matrix = _to_feature_matrix(X)
+    
+    # Same trees predict_proba would use (early stopping keeps the best round)
+    try:
+        iteration_range = (0, model.best_iteration + 1)
+    except AttributeError:
+        iteration_range = (0, 0)
+    return booster.inplace_predict(X_matrix, iteration_range=iteration_range)
+
+
 def evaluate_model(
     model: xgb.XGBClassifier,
     X_test: pd.DataFrame,
     y_test: pd.Series,
-    threshold: float = 0.5
+    threshold: float = 0.5,
+    y_proba: Optional[np.ndarray] = None
 ) -> Dict[str, float]:
     """
     Comprehensive model evaluation with flood-specific metrics.
@@ -35,6 +85,8 @@ def evaluate_model(
         X_test: Test features
         y_test: Test labels
         threshold: Decision threshold for binary classification
+        y_proba: Precomputed positive-class probabilities for X_test
+            (skips the model call when evaluating the same set repeatedly)
    
     Returns:
         Dictionary of evaluation metrics
@@ -46,21 +98,25 @@ def evaluate_model(
     logger.info("evaluating_model", test_samples=len(X_test), threshold=threshold)
     
     # Get predictions
-    y_proba = model.predict_proba(X_test)[:, 1]
-    y_pred = (y_proba >= threshold).astype(int)
+    if y_proba is None:
+        y_proba = predict_positive_proba(model, X_test)
+    y_pred = (y_proba >= threshold).view(np.int8)
+    
+    # Labels as a plain array once, shared by every metric below
+    y_true = np.asarray(y_test, dtype=np.int8)
     
     # Confusion matrix
-    tn, fp, fn, tp = confusion_matrix(y_test, y_pred).ravel()
+    tn, fp, fn, tp = confusion_matrix(y_true, y_pred, labels=[0, 1]).ravel()
     
-    # Metrics
-    precision = precision_score(y_test, y_pred, zero_division=0)
-    recall = recall_score(y_test, y_pred, zero_division=0)
-    f1 = f1_score(y_test, y_pred, zero_division=0)
-    f2 = fbeta_score(y_test, y_pred, beta=2.0, zero_division=0)  # Recall-focused
+    # Metrics, all derived from the single confusion matrix (zero_division=0)
+    precision = tp / (tp + fp) if (tp + fp) else 0.0
+    recall = tp / (tp + fn) if (tp + fn) else 0.0
+    f1 = 2 * tp / (2 * tp + fn + fp) if tp else 0.0
+    f2 = 5 * tp / (5 * tp + 4 * fn + fp) if tp else 0.0  # Recall-focused
     
     # ROC-AUC and PR-AUC
-    roc_auc = roc_auc_score(y_test, y_proba)
-    pr_auc = average_precision_score(y_test, y_proba)
+    roc_auc = roc_auc_score(y_true, y_proba)
+    pr_auc = average_precision_score(y_true, y_proba)
     
     metrics = {
         'true_negatives': int(tn),
@@ -99,7 +155,8 @@ def find_optimal_threshold(
     model: xgb.XGBClassifier,
     X_val: pd.DataFrame,
     y_val: pd.Series,
-    metric: str = 'f2'
+    metric: str = 'f2',
+    y_proba: Optional[np.ndarray] = None
 ) -> Tuple[float, float]:
     """
     Find optimal decision threshold by sweeping thresholds.
@@ -109,6 +166,7 @@ def find_optimal_threshold(
         X_val: Validation features
         y_val: Validation labels
         metric: Metric to optimize ('f1', 'f2', 'recall')
+        y_proba: Precomputed positive-class probabilities for X_val
     
     Returns:
         (optimal_threshold, best_score)
@@ -119,26 +177,33 @@ def find_optimal_threshold(
     """
     logger.info("finding_optimal_threshold", metric=metric)
     
-    # Get probabilities
-    y_proba = model.predict_proba(X_val)[:, 1]
+    # Get probabilities (one prediction pass, reused for every threshold)
+    if y_proba is None:
+        y_proba = predict_positive_proba(model, X_val)
     
     # Try thresholds from 0.1 to 0.9
     thresholds = np.arange(0.1, 0.95, 0.05)
-    scores = []
-    
-    for threshold in thresholds:
-        y_pred = (y_proba >= threshold).astype(int)
-        
-        if metric == 'f1':
-            score = f1_score(y_val, y_pred, zero_division=0)
-        elif metric == 'f2':
-            score = fbeta_score(y_val, y_pred, beta=2.0, zero_division=0)
-        elif metric == 'recall':
-            score = recall_score(y_val, y_pred, zero_division=0)
-        else:
-            raise ValueError(f"Unknown metric: {metric}")
-        
-        scores.append(score)
+    
+    # Confusion counts for every threshold at once: with the positive and
+    # negative probabilities sorted, "predicted positive" (proba >= t) is a
+    # searchsorted offset instead of a full pass per threshold
+    y_true = np.asarray(y_val, dtype=bool)
+    pos_proba = np.sort(y_proba[y_true])
+    neg_proba = np.sort(y_proba[~y_true])
+    
+    tp = len(pos_proba) - np.searchsorted(pos_proba, thresholds, side='left')
+    fp = len(neg_proba) - np.searchsorted(neg_proba, thresholds, side='left')
+    fn = len(pos_proba) - tp
+    
+    # Scores from the integer counts (zero_division=0 semantics, as in sklearn)
+    if metric in ('f1', 'f2'):
+        beta2 = 1.0 if metric == 'f1' else 4.0
+        denom = (1 + beta2) * tp + beta2 * fn + fp
+        scores = np.divide((1 + beta2) * tp, denom, out=np.zeros(len(thresholds)), where=denom > 0)
+    elif metric == 'recall':
+        scores = np.divide(tp, tp + fn, out=np.zeros(len(thresholds)), where=(tp + fn) > 0)
+    else:
+        raise ValueError(f"Unknown metric: {metric}")
     
     # Find best threshold
     best_idx = np.argmax(scores)
@@ -7,21 +7,160 @@ Prevents data leakage by only using historical information.
 Author: NEXUS-AI Team
 """
 
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import os
 import pandas as pd
 import numpy as np
+from numba import njit, prange
 
 from app.core.config import settings
 from app.core.logging import get_logger
 
 logger = get_logger("feature_engineering")
 
+# Below this many output values (rows x producers) the feature helpers run
+# their producers inline; a thread pool costs more than it saves
+THREADED_MIN_VALUES = 2_000_000
+
+# Identifier/target columns that are never model features
+FLOOD_METADATA_COLUMNS = frozenset({
+    'timestamp', 'station_id', 'water_level', 'warning_level', 'danger_level',
+    'label', 'quality_flag', 'river', 'location', 'lead_time_hours',
+    'event_id', 'event_duration_hours', 'peak_level'
+})
+LANDSLIDE_METADATA_COLUMNS = frozenset({
+    'date', 'grid_id', 'label', 'num_events',
+    'center_lon', 'center_lat', 'geometry'
+})
+
+
+def _downcast_features(df: pd.DataFrame, metadata_columns: frozenset) -> pd.DataFrame:
+    """Cast float64 feature inputs to float32 so derived features follow suit."""
+    float64_cols = [
+        col for col in df.columns
+        if col not in metadata_columns and df[col].dtype == np.float64
+    ]
+    if float64_cols:
+        df[float64_cols] = df[float64_cols].astype(np.float32)
+    return df
+
+
+def _group_layout(df: pd.DataFrame, group_col: Optional[str]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Dense group codes with each group's rows contiguous.
+    
+    Returns:
+        (codes, order): ``order`` is the stable permutation that makes the
+        groups contiguous, or None if the frame already is
+    """
+    if group_col is None:
+        return np.zeros(len(df), dtype=np.int64), None
+    
+    # Rows with a missing key come back as NaN; give them code -1
+    codes = df.groupby(group_col, sort=False, observed=True).ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    if (np.diff(codes) >= 0).all():
+        return codes, None
+    
+    order = np.argsort(codes, kind='stable')
+    return codes[order], order
+
+
+def _group_starts(codes: np.ndarray) -> np.ndarray:
+    """First row of each contiguous group in ``codes``, followed by the row count."""
+    return np.concatenate(([0], np.flatnonzero(np.diff(codes)) + 1, [len(codes)]))
+
+
+def _restore_order(values: np.ndarray, order: Optional[np.ndarray]) -> np.ndarray:
+    """Undo the ``_group_layout`` permutation on a per-row result."""
+    if order is None:
+        return values
+    restored = np.empty_like(values)
+    restored[order] = values
+    return restored
+
+
+def _grouped_shift(values: np.ndarray, codes: np.ndarray, periods: int) -> np.ndarray:
+    """
+    Shift ``values`` down by ``periods`` rows within each group.
+    
+    ``codes`` are dense group ids with each group's rows contiguous; rows
+    whose source would come from another group (or before the start) are NaN.
+    """
+    dtype = values.dtype if np.issubdtype(values.dtype, np.floating) else np.float64
+    shifted = np.full(len(values), np.nan, dtype=dtype)
+    
+    if periods < len(values):
+        shifted[periods:] = values[:len(values) - periods]
+        shifted[periods:][codes[periods:] != codes[:len(codes) - periods]] = np.nan
+    
+    # Rows without a group key (NaN station) get no lag, as in groupby.shift
+    shifted[codes < 0] = np.nan
+    return shifted
+
+
+def _compute_columns(producers: Dict[str, Callable[[], object]], num_rows: int) -> Dict[str, object]:
+    """
+    Run independent per-column producers, on a thread pool when the work is
+    large enough and cores allow.
+    
+    The producers are pandas Cython windows or numpy slicing over arrays
+    they own, so threads overlap without sharing lazily built state;
+    results come back in submission order.
+    """
+    workers = min(len(producers), os.cpu_count() or 1)
+    if workers <= 1 or num_rows * len(producers) < THREADED_MIN_VALUES:
+        return {name: produce() for name, produce in producers.items()}
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {name: executor.submit(produce) for name, produce in producers.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _append_columns(df: pd.DataFrame, columns: Dict[str, object]) -> pd.DataFrame:
+    """
+    Add computed columns to ``df`` in one concat instead of one insert each.
+    
+    Series are aligned on the index like ``df[name] = series``; names that
+    already exist are overwritten in place.
+    """
+    new_columns = {}
+    for name, values in columns.items():
+        if name in df.columns:
+            df[name] = values
+        else:
+            new_columns[name] = values
+    
+    if new_columns:
+        df = pd.concat([df, pd.DataFrame(new_columns, index=df.index)], axis=1)
+    return df
+
+
+def detect_freq_hours(df: pd.DataFrame, default: float = 1) -> float:
+    """
+    Median spacing of the timestamp column in hours.
+    
+    Args:
+        df: DataFrame sorted by timestamp
+        default: Returned when there is no timestamp column (hourly)
+    
+    Returns:
+        Hours between consecutive rows
+    """
+    if 'timestamp' not in df.columns or len(df) < 2:
+        return default
+    
+    time_diff = pd.to_datetime(df['timestamp'], cache=True).diff().dropna()
+    return time_diff.median().total_seconds() / 3600
+
 
 def create_lag_features(
     df: pd.DataFrame,
     columns: List[str],
-    lags: Optional[List[int]] = None
-) -> pd.DataFrame:
+    lags: Optional[List[int]] = None,
+    freq_hours: Optional[float] = None
+) -> Tuple[pd.DataFrame, List[str]]:
     """
     Create lagged versions of specified columns.
     
@@ -29,34 +168,43 @@ def create_lag_features(
         df: DataFrame with time series data (must be sorted by timestamp)
         columns: List of column names to create lags for
         lags: List of lag periods in days (default from config)
+        freq_hours: Hours between rows (detected from timestamp if None)
     
     Returns:
-        DataFrame with additional lag columns
+        Tuple of (DataFrame with additional lag columns, names of the lag columns)
     
     Example:
-        >>> df_lagged = create_lag_features(df, ['rainfall_mm'], lags=[1, 2, 3])
+        >>> df_lagged, lag_cols = create_lag_features(df, ['rainfall_mm'], lags=[1, 2, 3])
         >>> # Creates: rainfall_mm_lag_1, rainfall_mm_lag_2, rainfall_mm_lag_3
     """
     if lags is None:
         lags = settings.LAG_DAYS
     
-    df = df.copy()
+    df = df.copy(deep=False)
     
     # Group by station_id if present
     group_col = 'station_id' if 'station_id' in df.columns else None
     
     # Determine the frequency of the data
-    if 'timestamp' in df.columns and len(df) > 1:
-        time_diff = pd.to_datetime(df['timestamp']).diff().dropna()
-        freq_hours = time_diff.median().total_seconds() / 3600
-    else:
-        freq_hours = 1  # Default to hourly
+    if freq_hours is None:
+        freq_hours = detect_freq_hours(df)
     
+    if group_col:
+        # Hash the station keys once; every (column, lag) pair then shifts
+        # by slicing, with rows made group-contiguous if they aren't already
+        codes, order = _group_layout(df, group_col)
+    
+    producers = {}
     for col in columns:
         if col not in df.columns:
             logger.warning("column_not_found", column=col)
             continue
         
+        if group_col:
+            values = df[col].to_numpy()
+            if order is not None:
+                values = values[order]
+        
         for lag in lags:
             lag_col_name = f"{col}_lag_{lag}"
             
@@ -66,26 +214,72 @@ def create_lag_features(
             
             if group_col:
                 # Lag within each station
-                df[lag_col_name] = df.groupby(group_col)[col].shift(shift_periods)
+                producers[lag_col_name] = lambda values=values, periods=shift_periods: _restore_order(
+                    _grouped_shift(values, codes, periods), order
+                )
             else:
-                df[lag_col_name] = df[col].shift(shift_periods)
+                producers[lag_col_name] = lambda col=col, periods=shift_periods: df[col].shift(periods)
+    
+    # Every (column, lag) pair is independent
+    df = _append_columns(df, _compute_columns(producers, len(df)))
+    lag_cols = list(producers)
     
-    num_lag_features = len(columns) * len(lags)
     logger.info(
         "lag_features_created",
         columns=columns,
         lags=lags,
-        num_features=num_lag_features
+        num_features=len(lag_cols)
     )
     
-    return df
+    return df, lag_cols
+
+
+def _rolling_aggregate(
+    values: np.ndarray,
+    codes: Optional[np.ndarray],
+    order: Optional[np.ndarray],
+    window_periods: int,
+    agg: str,
+    out_dtype
+) -> np.ndarray:
+    """
+    ``rolling(min_periods=1).agg`` within each group on ``_group_layout``
+    rows, returned in row order.
+    
+    Groups on the precomputed integer codes, so each call builds its own
+    cheap grouping instead of sharing one pandas grouper between threads.
+    """
+    source = pd.Series(values, copy=False)
+    if codes is None:
+        return source.rolling(window=window_periods, min_periods=1).agg(agg).to_numpy(dtype=out_dtype)
+    
+    rolled = source.groupby(codes, sort=False).rolling(window=window_periods, min_periods=1).agg(agg)
+    # Grouped rolling comes back group by group; the groups are contiguous
+    # and in code order, so its values are already in layout order
+    out = np.where(codes >= 0, rolled.to_numpy(), np.nan).astype(out_dtype, copy=False)
+    return _restore_order(out, order)
+
+
+def _rolling_sums(
+    values: np.ndarray,
+    codes: np.ndarray,
+    group_starts: np.ndarray,
+    order: Optional[np.ndarray],
+    window_periods: np.ndarray,
+    out_dtype
+) -> List[np.ndarray]:
+    """Per-group trailing sums for each window on ``_group_layout`` rows, in row order."""
+    out = np.empty((len(window_periods), len(values)), dtype=out_dtype)
+    _grouped_rolling_sums(values, codes, group_starts, window_periods, out)
+    return [_restore_order(sums, order) for sums in out]
 
 
 def create_rolling_features(
     df: pd.DataFrame,
     columns: List[str],
     windows: Optional[List[int]] = None,
-    aggregations: List[str] = ['sum']
+    aggregations: List[str] = ['sum'],
+    freq_hours: Optional[float] = None
 ) -> pd.DataFrame:
     """
     Create rolling window aggregations.
@@ -95,6 +289,7 @@ def create_rolling_features(
         columns: List of column names to aggregate
         windows: List of window sizes in days (default from config)
         aggregations: List of aggregation functions ('sum', 'mean', 'max')
+        freq_hours: Hours between rows (detected from timestamp if None)
     
     Returns:
         DataFrame with additional rolling features
@@ -111,38 +306,72 @@ def create_rolling_features(
     if windows is None:
         windows = settings.ROLLING_WINDOWS
     
-    df = df.copy()
+    df = df.copy(deep=False)
     
     # Group by station_id if present
     group_col = 'station_id' if 'station_id' in df.columns else None
     
     # Determine the frequency of the data
-    if 'timestamp' in df.columns and len(df) > 1:
-        time_diff = pd.to_datetime(df['timestamp']).diff().dropna()
-        freq_hours = time_diff.median().total_seconds() / 3600
-    else:
-        freq_hours = 1  # Default to hourly
+    if freq_hours is None:
+        freq_hours = detect_freq_hours(df)
+    
+    # Group codes are computed once, with each group's rows made contiguous;
+    # every column/window/aggregation then works on plain arrays
+    codes, order = _group_layout(df, group_col)
+    group_starts = _group_starts(codes)
+    
+    # Calculate rolling windows in periods based on data frequency
+    # window is in days, so periods = window_days * (24 hours/day) / hours_per_period
+    window_periods = np.array(
+        [int(window * 24 / freq_hours) for window in windows], dtype=np.int64
+    )
     
+    feature_names = []
+    computed = {}
+    producers = {}
     for col in columns:
         if col not in df.columns:
             logger.warning("column_not_found", column=col)
             continue
         
-        for window in windows:
+        # pandas rolls in float64; keep the source column's float width
+        out_dtype = df[col].dtype if df[col].dtype == np.float32 else np.float64
+        
+        values = df[col].to_numpy(dtype=np.float64)
+        if order is not None:
+            values = values[order]
+        
+        feature_names.extend(
+            f"{col}_{window}d_{agg}" for window in windows for agg in aggregations
+        )
+        
+        # Sums run through the sliding-sum kernel: every window in one call
+        # (one O(N) scan per window, independent of window length, cells in
+        # parallel), so they stay off the thread pool
+        if 'sum' in aggregations:
+            sums = _rolling_sums(values, codes, group_starts, order, window_periods, out_dtype)
+            for window, column_sums in zip(windows, sums):
+                computed[f"{col}_{window}d_sum"] = column_sums
+        
+        # Other aggregations use pandas' grouped Cython windows (no
+        # per-group Python call)
+        for window, periods in zip(windows, window_periods):
             for agg in aggregations:
-                feature_name = f"{col}_{window}d_{agg}"
-                
-                # Calculate rolling window in periods based on data frequency
-                # window is in days, so periods = window_days * (24 hours/day) / hours_per_period
-                window_periods = int(window * 24 / freq_hours)
-                
-                if group_col:
-                    # Rolling within each station
-                    df[feature_name] = df.groupby(group_col)[col].transform(
-                        lambda x: x.rolling(window=window_periods, min_periods=1).agg(agg)
-                    )
-                else:
-                    df[feature_name] = df[col].rolling(window=window_periods, min_periods=1).agg(agg)
+                if agg == 'sum':
+                    continue
+                producers[f"{col}_{window}d_{agg}"] = partial(
+                    _rolling_aggregate,
+                    values,
+                    codes if group_col else None,
+                    order,
+                    int(periods),
+                    agg,
+                    out_dtype
+                )
+    
+    # Every (column, window, aggregation) triple is independent
+    computed.update(_compute_columns(producers, len(df)))
+    df = _append_columns(df, {name: computed[name] for name in feature_names})
     
     num_rolling_features = len(columns) * len(windows) * len(aggregations)
     logger.info(
@@ -216,26 +445,31 @@ def engineer_flood_features(
     """
     logger.info("starting_feature_engineering", rows=len(df))
     
-    df = df.copy()
-    
-    # Ensure sorted by station and time
+    # Ensure sorted by station and time (returns a new frame, so no upfront copy)
     if 'station_id' in df.columns:
         df = df.sort_values(['station_id', 'timestamp']).reset_index(drop=True)
     else:
         df = df.sort_values('timestamp').reset_index(drop=True)
     
+    # float32 inputs keep every derived feature float32 (XGBoost's native width)
+    df = _downcast_features(df, FLOOD_METADATA_COLUMNS)
+    
     # 1. Create lag features for rainfall
     columns_to_lag = [rainfall_column]
     if temperature_column and temperature_column in df.columns:
         columns_to_lag.append(temperature_column)
     
-    df = create_lag_features(df, columns_to_lag)
+    # Sampling interval, detected once and shared by the lag and rolling steps
+    freq_hours = detect_freq_hours(df)
+    
+    df, lag_cols = create_lag_features(df, columns_to_lag, freq_hours=freq_hours)
     
     # 2. Create rolling sum features for rainfall
     df = create_rolling_features(
         df,
         [rainfall_column],
-        aggregations=['sum']
+        aggregations=['sum'],
+        freq_hours=freq_hours
     )
     
     # 3. Verify static terrain features
@@ -246,9 +480,6 @@ def engineer_flood_features(
     # Only check lag features, not all columns (some columns like event_id may have NaN)
     before_drop = len(df)
     
-    # Identify lag feature columns
-    lag_cols = [col for col in df.columns if '_lag_' in col]
-    
     if lag_cols:
         # Drop only rows where lag features are NaN
         df = df.dropna(subset=lag_cols).reset_index(drop=True)
@@ -263,13 +494,8 @@ def engineer_flood_features(
         )
     
     # 5. Identify feature columns (exclude metadata and target)
-    exclude_cols = {
-        'timestamp', 'station_id', 'water_level', 'warning_level', 'danger_level',
-        'label', 'quality_flag', 'river', 'location', 'lead_time_hours',
-        'event_id', 'event_duration_hours', 'peak_level'
-    }
-    
-    feature_cols = [col for col in df.columns if col not in exclude_cols]
+    feature_cols = [col for col in df.columns if col not in FLOOD_METADATA_COLUMNS]
+    df.attrs['feature_cols'] = feature_cols
     
     logger.info(
         "feature_engineering_complete",
@@ -291,13 +517,12 @@ def get_feature_columns(df: pd.DataFrame) -> List[str]:
     Returns:
         List of feature column names
     """
-    exclude_cols = {
-        'timestamp', 'station_id', 'water_level', 'warning_level', 'danger_level',
-        'label', 'quality_flag', 'river', 'location', 'lead_time_hours',
-        'event_id', 'event_duration_hours', 'peak_level'
-    }
+    # Recorded by the engineer_* pipelines; only trusted while all still present
+    feature_cols = df.attrs.get('feature_cols')
+    if feature_cols is not None and set(feature_cols).issubset(df.columns):
+        return list(feature_cols)
     
-    feature_cols = [col for col in df.columns if col not in exclude_cols]
+    feature_cols = [col for col in df.columns if col not in FLOOD_METADATA_COLUMNS]
     
     return feature_cols
 
@@ -305,8 +530,9 @@ def get_feature_columns(df: pd.DataFrame) -> List[str]:
 def create_antecedent_rainfall_index(
     df: pd.DataFrame,
     rainfall_column: str = 'rainfall_mm',
-    windows: Optional[List[int]] = None
-) -> pd.DataFrame:
+    windows: Optional[List[int]] = None,
+    freq_hours: Optional[float] = None
+) -> Tuple[pd.DataFrame, List[str]]:
     """
     Create Antecedent Rainfall Index (ARI) features for landslide prediction.
     
@@ -317,41 +543,55 @@ def create_antecedent_rainfall_index(
         df: DataFrame with rainfall data (sorted by time)
         rainfall_column: Name of rainfall column
         windows: List of window sizes in days (default: [3, 7, 14, 30])
+        freq_hours: Hours between rows (detected per cell from date if None)
     
     Returns:
-        DataFrame with ARI features added
+        Tuple of (DataFrame with ARI features added, names of the ARI columns)
     
     Example:
-        >>> df = create_antecedent_rainfall_index(df, windows=[7, 14, 30])
+        >>> df, ari_cols = create_antecedent_rainfall_index(df, windows=[7, 14, 30])
         >>> # Creates: rainfall_ari_7d, rainfall_ari_14d, rainfall_ari_30d
     """
     if windows is None:
         windows = [3, 7, 14, 30]
     
-    df = df.copy()
+    df = df.copy(deep=False)
     
     # Group by grid_id if present
     group_col = 'grid_id' if 'grid_id' in df.columns else None
     
-    # Determine frequency
-    if 'date' in df.columns and len(df) > 1:
-        time_diff = pd.to_datetime(df['date']).diff().dropna()
-        freq_hours = time_diff.median().total_seconds() / 3600
-    else:
+    # Determine frequency (within each cell, so jumps between cells don't count)
+    if freq_hours is None:
         freq_hours = 24  # Daily data
+        if 'date' in df.columns and len(df) > 1:
+            dates = pd.to_datetime(df['date'], cache=True)
+            time_diff = (dates.groupby(df[group_col], sort=False, observed=True).diff() if group_col else dates.diff()).dropna()
+            if len(time_diff) > 0:
+                freq_hours = time_diff.median().total_seconds() / 3600
+    
+    # Rainfall laid out cell by cell, so each window is one linear scan
+    codes, order = _group_layout(df, group_col)
+    rainfall = df[rainfall_column].to_numpy(dtype=np.float64)
+    if order is not None:
+        rainfall = rainfall[order]
+    
+    # Keep the rainfall column's float width
+    out_dtype = df[rainfall_column].dtype if df[rainfall_column].dtype == np.float32 else np.float64
+    
+    ari_cols = [f"{rainfall_column}_ari_{window}d" for window in windows]
+    window_periods = np.array(
+        [max(1, int(window * 24 / freq_hours)) for window in windows], dtype=np.int64
+    )
     
-    for window in windows:
-        feature_name = f"{rainfall_column}_ari_{window}d"
-        
-        # Calculate rolling sum
-        window_periods = int(window * 24 / freq_hours)
-        
-        if group_col:
-            df[feature_name] = df.groupby(group_col)[rainfall_column].transform(
-                lambda x: x.rolling(window=window_periods, min_periods=1).sum()
-            )
-        else:
-            df[feature_name] = df[rainfall_column].rolling(window=window_periods, min_periods=1).sum()
+    # Every window in one kernel call: cells run in parallel, and each cell's
+    # rainfall is scanned for all windows while it is still in cache
+    group_starts = _group_starts(codes)
+    sums = np.empty((len(windows), len(rainfall)), dtype=out_dtype)
+    _grouped_rolling_sums(rainfall, codes, group_starts, window_periods, sums)
+    
+    df = _append_columns(df, {
+        name: _restore_order(sums[k], order) for k, name in enumerate(ari_cols)
+    })
     
     logger.info(
         "ari_features_created",
@@ -359,7 +599,53 @@ def create_antecedent_rainfall_index(
         num_features=len(windows)
     )
     
-    return df
+    return df, ari_cols
+
+
+@njit(cache=True, parallel=True)
+def _grouped_rolling_sums(values, codes, group_starts, windows, out):
+    """
+    Trailing sums over each of ``windows`` rows within contiguous groups,
+    groups in parallel.
+    
+    Matches ``rolling(window, min_periods=1).sum()``: NaNs are skipped and
+    a window with no observations is NaN. Rows with code -1 (no group) are NaN.
+    ``group_starts`` holds the first row of each contiguous group followed by
+    the row count; ``out[k]`` receives the sums for ``windows[k]``.
+    """
+    for g in prange(group_starts.shape[0] - 1):
+        start = group_starts[g]
+        end = group_starts[g + 1]
+        for k in range(windows.shape[0]):
+            window = windows[k]
+            total = 0.0
+            count = 0
+            for i in range(start, end):
+                value = values[i]
+                if not np.isnan(value):
+                    total += value
+                    count += 1
+                
+                leaving = i - window
+                if leaving >= start:
+                    value = values[leaving]
+                    if not np.isnan(value):
+                        total -= value
+                        count -= 1
+                
+                if codes[i] < 0 or count == 0:
+                    out[k, i] = np.nan
+                else:
+                    out[k, i] = total
+
+
+@njit(cache=True)
+def _physics_products(slope, rainfall, curvature, ari, slope_rain, slope_ari, curvature_rain):
+    """Slope × rainfall, slope × ARI and curvature × rainfall in one pass."""
+    for i in range(slope.shape[0]):
+        slope_rain[i] = slope[i] * rainfall[i]
+        slope_ari[i] = slope[i] * ari[i]
+        curvature_rain[i] = curvature[i] * rainfall[i]
 
 
 def create_physics_interactions(
@@ -380,25 +666,44 @@ def create_physics_interactions(
     Returns:
         DataFrame with interaction features
     """
-    df = df.copy()
+    df = df.copy(deep=False)
     
     interactions_created = []
     
-    # Slope × Rainfall interaction
-    if 'slope' in df.columns and rainfall_column in df.columns:
-        df['slope_rainfall_interaction'] = df['slope'] * df[rainfall_column]
-        interactions_created.append('slope_rainfall_interaction')
-    
-    # Slope × ARI (if ARI exists)
+    slope = df['slope'].to_numpy() if 'slope' in df.columns else None
+    curvature = df['curvature'].to_numpy() if 'curvature' in df.columns else None
+    rainfall = df[rainfall_column].to_numpy() if rainfall_column in df.columns else None
     ari_cols = [col for col in df.columns if 'ari_14d' in col]
-    if 'slope' in df.columns and ari_cols:
-        df['slope_ari14d_interaction'] = df['slope'] * df[ari_cols[0]]
-        interactions_created.append('slope_ari14d_interaction')
+    ari = df[ari_cols[0]].to_numpy() if ari_cols else None
     
-    # Curvature × Rainfall interaction
-    if 'curvature' in df.columns and rainfall_column in df.columns:
-        df['curvature_rainfall_interaction'] = df['curvature'] * df[rainfall_column]
-        interactions_created.append('curvature_rainfall_interaction')
+    if slope is not None and curvature is not None and rainfall is not None and ari is not None:
+        # All three interactions in one fused pass over the inputs
+        outputs = tuple(
+            np.empty(len(df), dtype=np.result_type(left, right))
+            for left, right in ((slope, rainfall), (slope, ari), (curvature, rainfall))
+        )
+        _physics_products(slope, rainfall, curvature, ari, *outputs)
+        df['slope_rainfall_interaction'] = outputs[0]
+        df['slope_ari14d_interaction'] = outputs[1]
+        df['curvature_rainfall_interaction'] = outputs[2]
+        interactions_created = [
+            'slope_rainfall_interaction', 'slope_ari14d_interaction', 'curvature_rainfall_interaction'
+        ]
+    else:
+        # Slope × Rainfall interaction
+        if slope is not None and rainfall is not None:
+            df['slope_rainfall_interaction'] = slope * rainfall
+            interactions_created.append('slope_rainfall_interaction')
+        
+        # Slope × ARI (if ARI exists)
+        if slope is not None and ari is not None:
+            df['slope_ari14d_interaction'] = slope * ari
+            interactions_created.append('slope_ari14d_interaction')
+        
+        # Curvature × Rainfall interaction
+        if curvature is not None and rainfall is not None:
+            df['curvature_rainfall_interaction'] = curvature * rainfall
+            interactions_created.append('curvature_rainfall_interaction')
     
     logger.info(
         "physics_interactions_created",
@@ -435,31 +740,32 @@ def engineer_landslide_features(
     """
     logger.info("starting_landslide_feature_engineering", rows=len(df))
     
-    df = df.copy()
-    
-    # Ensure sorted by grid and time
+    # Ensure sorted by grid and time (returns a new frame, so no upfront copy)
     if 'grid_id' in df.columns:
         df = df.sort_values(['grid_id', 'date']).reset_index(drop=True)
     else:
         df = df.sort_values('date').reset_index(drop=True)
     
+    # float32 inputs keep every derived feature float32 (XGBoost's native width)
+    df = _downcast_features(df, LANDSLIDE_METADATA_COLUMNS)
+    
     # 1. Create Antecedent Rainfall Index (ARI)
-    df = create_antecedent_rainfall_index(df, rainfall_column, windows=[3, 7, 14, 30])
+    df, ari_cols = create_antecedent_rainfall_index(df, rainfall_column, windows=[3, 7, 14, 30])
     
     # 2. Create lag features (shorter lags for landslides)
     columns_to_lag = [rainfall_column]
     if 'temperature' in df.columns:
         columns_to_lag.append('temperature')
     
-    df = create_lag_features(df, columns_to_lag, lags=[1, 3, 7])
+    df, lag_cols = create_lag_features(df, columns_to_lag, lags=[1, 3, 7])
     
-    # 3. Create rolling sums (redundant with ARI but kept for consistency)
-    df = create_rolling_features(
-        df,
-        [rainfall_column],
-        windows=[3, 7],
-        aggregations=['sum']
-    )
+    # 3. Rolling sums: the same per-cell trailing sums as the 3d/7d ARI, so
+    # alias those rather than scanning the rainfall again (names are kept
+    # for the model's feature list)
+    df = _append_columns(df, {
+        f"{rainfall_column}_{window}d_sum": df[f"{rainfall_column}_ari_{window}d"]
+        for window in (3, 7)
+    })
     
     # 4. Create physics-informed interactions
     df = create_physics_interactions(df, rainfall_column)
@@ -469,10 +775,10 @@ def engineer_landslide_features(
     
     # 6. Drop rows with NaN in lag features
     before_drop = len(df)
-    lag_cols = [col for col in df.columns if '_lag_' in col or '_ari_' in col]
+    history_cols = ari_cols + lag_cols
     
-    if lag_cols:
-        df = df.dropna(subset=lag_cols).reset_index(drop=True)
+    if history_cols:
+        df = df.dropna(subset=history_cols).reset_index(drop=True)
     
     after_drop = len(df)
     
@@ -484,12 +790,8 @@ def engineer_landslide_features(
         )
     
     # 7. Identify feature columns
-    exclude_cols = {
-        'date', 'grid_id', 'label', 'num_events',
-        'center_lon', 'center_lat', 'geometry'
-    }
-    
-    feature_cols = [col for col in df.columns if col not in exclude_cols]
+    feature_cols = [col for col in df.columns if col not in LANDSLIDE_METADATA_COLUMNS]
+    df.attrs['feature_cols'] = feature_cols
     
     logger.info(
         "landslide_feature_engineering_complete",
@@ -8,7 +8,7 @@ Author: NEXUS-AI Team
 """
 
 from typing import List, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -17,6 +17,9 @@ from app.core.logging import get_logger
 
 logger = get_logger("mock_landslide_inventory")
 
+# Rows per Parquet row group when saving an inventory as Parquet
+INVENTORY_ROW_GROUP_SIZE = 10_000
+
 
 def generate_mock_landslide_inventory(
     bbox: Tuple[float, float, float, float],
@@ -42,7 +45,7 @@ def generate_mock_landslide_inventory(
         >>> bbox = (89.0, 24.0, 96.0, 28.0)  # Assam region
         >>> inventory = generate_mock_landslide_inventory(bbox, start, end)
     """
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     
     logger.info(
         "generating_mock_landslides",
@@ -54,64 +57,52 @@ def generate_mock_landslide_inventory(
     
     min_lon, min_lat, max_lon, max_lat = bbox
     
-    # Generate events with realistic patterns
-    events = []
+    # Generate events with realistic patterns, all events drawn at once
     
     # Create spatial clusters (landslides occur in groups)
     num_clusters = max(3, num_events // 20)
-    cluster_centers = [
-        (
-            np.random.uniform(min_lon, max_lon),
-            np.random.uniform(min_lat, max_lat)
-        )
-        for _ in range(num_clusters)
-    ]
-    
-    for i in range(num_events):
-        # Assign to a random cluster
-        cluster_idx = np.random.randint(0, num_clusters)
-        center_lon, center_lat = cluster_centers[cluster_idx]
-        
-        # Add scatter around cluster center (±0.1 degrees ≈ 10km)
-        lon = center_lon + np.random.normal(0, 0.1)
-        lat = center_lat + np.random.normal(0, 0.05)
-        
-        # Clip to bbox
-        lon = np.clip(lon, min_lon, max_lon)
-        lat = np.clip(lat, min_lat, max_lat)
-        
-        # Generate date (concentrated in monsoon: Jun-Sep)
-        days_range = (end_date - start_date).days
-        
-        # Bias towards monsoon months (Jun=6, Sep=9)
-        # Use beta distribution to concentrate events in middle of period
-        date_offset = int(np.random.beta(2, 2) * days_range)
-        event_date = start_date + timedelta(days=date_offset)
-        
-        # Further bias: 70% in monsoon months
-        month = event_date.month
-        if np.random.random() > 0.7 and month not in [6, 7, 8, 9]:
-            # Re-sample to monsoon
-            monsoon_start = datetime(event_date.year, 6, 1)
-            monsoon_end = datetime(event_date.year, 9, 30)
-            monsoon_days = (monsoon_end - monsoon_start).days
-            monsoon_offset = np.random.randint(0, monsoon_days)
-            event_date = monsoon_start + timedelta(days=monsoon_offset)
-        
-        # Magnitude: small (1), medium (2), large (3)
-        magnitude = np.random.choice([1, 2, 3], p=[0.7, 0.25, 0.05])
-        
-        events.append({
-            'landslide_id': f'LS_{i:04d}',
-            'lat': round(lat, 6),
-            'lon': round(lon, 6),
-            'date': event_date.strftime('%Y-%m-%d'),
-            'magnitude': magnitude,
-            'type': 'rainfall-triggered'
-        })
-    
-    df = pd.DataFrame(events)
-    df = df.sort_values('date').reset_index(drop=True)
+    cluster_lon = rng.uniform(min_lon, max_lon, num_clusters)
+    cluster_lat = rng.uniform(min_lat, max_lat, num_clusters)
+    
+    # Assign each event to a random cluster
+    cluster_idx = rng.integers(0, num_clusters, num_events)
+    
+    # Add scatter around cluster center (±0.1 degrees ≈ 10km), clipped to bbox
+    lon = np.clip(cluster_lon[cluster_idx] + rng.normal(0, 0.1, num_events), min_lon, max_lon)
+    lat = np.clip(cluster_lat[cluster_idx] + rng.normal(0, 0.05, num_events), min_lat, max_lat)
+    
+    # Generate date (concentrated in monsoon: Jun-Sep)
+    days_range = (end_date - start_date).days
+    
+    # Bias towards monsoon months (Jun=6, Sep=9)
+    # Use beta distribution to concentrate events in middle of period
+    date_offset = (rng.beta(2, 2, num_events) * days_range).astype(np.int64)
+    event_date = np.datetime64(start_date.date(), 'D') + date_offset.astype('timedelta64[D]')
+    
+    # Further bias: 70% in monsoon months
+    month = event_date.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    resample = (rng.random(num_events) > 0.7) & ((month < 6) | (month > 9))
+    
+    # Re-sample those to a day in the same year's monsoon (from Jun 1)
+    monsoon_start = (event_date[resample].astype('datetime64[Y]') + np.timedelta64(5, 'M')).astype('datetime64[D]')
+    monsoon_days = 121  # Jun 1 -> Sep 30
+    event_date[resample] = monsoon_start + rng.integers(0, monsoon_days, resample.sum()).astype('timedelta64[D]')
+    
+    # Magnitude: small (1), medium (2), large (3)
+    magnitude = rng.choice([1, 2, 3], size=num_events, p=[0.7, 0.25, 0.05])
+    
+    # Order events by date, then build the frame straight from typed columns
+    order = np.argsort(event_date, kind='stable')
+    event_date = event_date[order]
+    
+    df = pd.DataFrame({
+        'landslide_id': np.char.add('LS_', np.char.zfill(order.astype(str), 4)).astype(object),
+        'lat': np.round(lat[order], 6),
+        'lon': np.round(lon[order], 6),
+        'date': np.datetime_as_string(event_date, unit='D').astype(object),
+        'magnitude': magnitude[order],
+        'type': 'rainfall-triggered'
+    })
     
     logger.info(
         "mock_landslides_generated",
@@ -121,9 +112,8 @@ def generate_mock_landslide_inventory(
     )
     
     # Log monthly distribution
-    df_temp = df.copy()
-    df_temp['month'] = pd.to_datetime(df_temp['date']).dt.month
-    monthly_counts = df_temp.groupby('month').size().to_dict()
+    counts = np.bincount(event_date.astype('datetime64[M]').astype(np.int64) % 12 + 1, minlength=13)
+    monthly_counts = {month: int(counts[month]) for month in range(1, 13) if counts[month]}
     logger.info("monthly_distribution", counts=monthly_counts)
     
     return df
@@ -134,16 +124,23 @@ def save_mock_inventory(
     output_path: str = "data/landslide_inventory_mock.csv"
 ) -> None:
     """
-    Save mock inventory to CSV.
+    Save mock inventory to CSV, or to Parquet for a ``.parquet`` path.
     
     Args:
         df: Landslide inventory DataFrame
-        output_path: Path to save CSV
+        output_path: Path to save CSV / Parquet
     """
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    df.to_csv(output_file, index=False)
+    if output_file.suffix == '.parquet':
+        # Bounded row groups let readers stream large inventories in pieces
+        df.to_parquet(
+            output_file, engine='pyarrow', compression='zstd',
+            index=False, row_group_size=INVENTORY_ROW_GROUP_SIZE
+        )
+    else:
+        df.to_csv(output_file, index=False)
     logger.info("inventory_saved", path=str(output_file), events=len(df))
 
 
@@ -151,10 +148,10 @@ def load_landslide_inventory(
     filepath: str
 ) -> pd.DataFrame:
     """
-    Load landslide inventory from CSV.
+    Load landslide inventory from CSV or Parquet.
     
     Args:
-        filepath: Path to inventory CSV
+        filepath: Path to inventory CSV / Parquet
     
     Returns:
         DataFrame with standardized schema
@@ -167,16 +164,30 @@ def load_landslide_inventory(
     if not Path(filepath).exists():
         raise FileNotFoundError(f"Inventory file not found: {filepath}")
     
-    df = pd.read_csv(filepath)
+    is_parquet = Path(filepath).suffix == '.parquet'
     
-    # Validate required columns
+    # Validate required columns (header / schema only, before reading the body)
+    if is_parquet:
+        import pyarrow.parquet as pq
+        columns = pq.read_schema(filepath).names
+    else:
+        columns = pd.read_csv(filepath, nrows=0).columns
     required = ['lat', 'lon', 'date']
-    missing = [col for col in required if col not in df.columns]
+    missing = [col for col in required if col not in columns]
     if missing:
         raise ValueError(f"Missing required columns: {missing}")
     
-    # Parse date
-    df['date'] = pd.to_datetime(df['date'])
+    if is_parquet:
+        df = pd.read_parquet(filepath, engine='pyarrow')
+        df['date'] = pd.to_datetime(df['date'])
+    else:
+        # Read and type the date column in Arrow's native CSV reader; fall back
+        # to the C reader + to_datetime without pyarrow or for non-ISO dates
+        try:
+            df = pd.read_csv(filepath, engine='pyarrow', dtype={'date': 'datetime64[us]'})
+        except (ImportError, ValueError):
+            df = pd.read_csv(filepath)
+            df['date'] = pd.to_datetime(df['date'])
     
     logger.info(
         "inventory_loaded",
@@ -6,9 +6,10 @@ Generates SHAP values for model interpretability (MANDATORY for government use).
 Author: NEXUS-AI Team
 """
 
-from typing import Optional, List, Tuple, Dict
+from typing import Optional, List, Tuple, Dict, Union
 from pathlib import Path
 import pickle
+import orjson
 import pandas as pd
 import numpy as np
 import shap
@@ -20,36 +21,82 @@ from app.core.logging import get_logger
 logger = get_logger("shap_analysis")
 
 
+def _as_float32_matrix(X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+    """C-contiguous float32 rows, the width XGBoost evaluates trees in."""
+    if isinstance(X, pd.DataFrame):
+        X = X.to_numpy(dtype=np.float32)
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
 def compute_shap_values(
     model: xgb.XGBClassifier,
-    X_background: pd.DataFrame,
-    X_explain: Optional[pd.DataFrame] = None
+    X_background: Optional[Union[pd.DataFrame, np.ndarray]] = None,
+    X_explain: Optional[Union[pd.DataFrame, np.ndarray]] = None,
+    feature_perturbation: str = 'tree_path_dependent'
 ) -> Tuple[shap.Explanation, shap.TreeExplainer]:
     """
     Compute SHAP values for model predictions.
     
+    'tree_path_dependent' reads the cover statistics stored in the trees and
+    needs no background data (the same explainer the API builds at startup).
+    'interventional' integrates over a background sample instead, which is
+    exact w.r.t. feature independence but costs a pass over every background
+    row per explained row, so the background is capped at 100 samples.
+    
+    Inputs may be DataFrames or arrays; a large background can be passed as
+    ``np.load(path, mmap_mode='r')`` so only the sampled rows are read.
+    
     Args:
         model: Trained XGBoost model
-        X_background: Background dataset for TreeExplainer (sample of training data)
+        X_background: Sample of training data (required for 'interventional',
+            and used as the data to explain when X_explain is None)
         X_explain: Data to explain (default: use background)
+        feature_perturbation: 'tree_path_dependent' or 'interventional'
     
     Returns:
         (shap_values, explainer)
     
     Example:
-        >>> shap_values, explainer = compute_shap_values(model, X_train.sample(100), X_test)
+        >>> shap_values, explainer = compute_shap_values(model, X_explain=X_test)
     """
     if X_explain is None:
         X_explain = X_background
+    if X_explain is None:
+        raise ValueError("X_explain or X_background is required")
+    
+    if isinstance(X_explain, pd.DataFrame):
+        feature_names = list(X_explain.columns)
+    else:
+        feature_names = model.get_booster().feature_names
+    
+    # SHAP copies whatever it is given into float arrays; hand it the matrix
+    # XGBoost would build anyway (names go to the explainer instead)
+    X_explain = _as_float32_matrix(X_explain)
     
     logger.info(
         "computing_shap_values",
-        background_size=len(X_background),
-        explain_size=len(X_explain)
+        background_size=len(X_background) if X_background is not None else 0,
+        explain_size=len(X_explain),
+        feature_perturbation=feature_perturbation
     )
     
     # Create TreeExplainer (fast for XGBoost)
-    explainer = shap.TreeExplainer(model, X_background)
+    if feature_perturbation == 'interventional':
+        if X_background is None:
+            raise ValueError("X_background is required for interventional SHAP")
+        background = _as_float32_matrix(shap.sample(X_background, 100, random_state=42))
+        explainer = shap.TreeExplainer(
+            model,
+            background,
+            feature_perturbation='interventional',
+            feature_names=feature_names
+        )
+    else:
+        explainer = shap.TreeExplainer(
+            model,
+            feature_perturbation=feature_perturbation,
+            feature_names=feature_names
+        )
     
     # Compute SHAP values
     shap_values = explainer(X_explain)
@@ -81,29 +128,28 @@ def get_top_drivers(
     """
     logger.info("extracting_top_drivers", top_k=top_k)
     
-    results = []
+    values = np.asarray(shap_values.values)
+    top_k = min(top_k, values.shape[1])
     
-    for i in range(len(X)):
-        # Get absolute SHAP values for this prediction
-        abs_shap = np.abs(shap_values.values[i])
-        
-        # Get top K indices
-        top_indices = np.argsort(abs_shap)[-top_k:][::-1]
-        
-        # Build result row
-        row = {'sample_idx': i}
-        for rank, idx in enumerate(top_indices, 1):
-            feature_name = X.columns[idx]
-            shap_value = shap_values.values[i, idx]
-            feature_value = X.iloc[i, idx]
-            
-            row[f'top{rank}_feature'] = feature_name
-            row[f'top{rank}_shap'] = shap_value
-            row[f'top{rank}_value'] = feature_value
-        
-        results.append(row)
+    # Top K by |SHAP| for all samples at once: partial selection, then a
+    # stable sort of just those K (ties go to the earlier feature)
+    neg_abs = -np.abs(values)
+    top_indices = np.argpartition(neg_abs, top_k - 1, axis=1)[:, :top_k]
+    rank_order = np.argsort(np.take_along_axis(neg_abs, top_indices, axis=1), axis=1, kind='stable')
+    top_indices = np.take_along_axis(top_indices, rank_order, axis=1)
     
-    df_drivers = pd.DataFrame(results)
+    top_features = X.columns.to_numpy()[top_indices]
+    top_shap = np.take_along_axis(values, top_indices, axis=1)
+    top_values = np.take_along_axis(X.to_numpy(), top_indices, axis=1)
+    
+    # Build the result column by column
+    columns = {'sample_idx': np.arange(len(X))}
+    for rank in range(top_k):
+        columns[f'top{rank + 1}_feature'] = top_features[:, rank]
+        columns[f'top{rank + 1}_shap'] = top_shap[:, rank]
+        columns[f'top{rank + 1}_value'] = top_values[:, rank]
+    
+    df_drivers = pd.DataFrame(columns)
     
     logger.info("top_drivers_extracted", samples=len(df_drivers))
     
@@ -117,6 +163,9 @@ def save_shap_artifacts(
     """
     Save SHAP values to artifacts directory.
     
+    Arrays go to a compressed .npz and feature names to a JSON sidecar,
+    so loading never unpickles a shap object graph.
+    
     Args:
         shap_values: Computed SHAP values
         output_dir: Directory to save (default from config)
@@ -127,10 +176,22 @@ def save_shap_artifacts(
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
-    # Save SHAP values
-    shap_path = output_path / "shap_values.pkl"
-    with open(shap_path, 'wb') as f:
-        pickle.dump(shap_values, f)
+    # Save SHAP arrays
+    shap_path = output_path / "shap_values.npz"
+    np.savez_compressed(
+        shap_path,
+        values=np.asarray(shap_values.values, dtype=np.float32),
+        base=np.asarray(shap_values.base_values),
+        data=np.asarray(shap_values.data)
+    )
+    
+    # Save feature names
+    meta_path = output_path / "shap_meta.json"
+    feature_names = shap_values.feature_names
+    meta_path.write_bytes(orjson.dumps(
+        {'feature_names': list(feature_names) if feature_names is not None else None},
+        option=orjson.OPT_INDENT_2
+    ))
     
     logger.info("shap_values_saved", path=str(shap_path))
 
@@ -150,10 +211,28 @@ def load_shap_artifacts(
     if artifact_dir is None:
         artifact_dir = settings.ML_ARTIFACTS_DIR
     
-    shap_path = Path(artifact_dir) / "shap_values.pkl"
+    artifact_path = Path(artifact_dir)
+    shap_path = artifact_path / "shap_values.npz"
     
-    with open(shap_path, 'rb') as f:
-        shap_values = pickle.load(f)
+    if not shap_path.exists():
+        # Artifacts written before the .npz format
+        legacy_path = artifact_path / "shap_values.pkl"
+        with open(legacy_path, 'rb') as f:
+            shap_values = pickle.load(f)
+        
+        logger.info("shap_values_loaded", path=str(legacy_path))
+        
+        return shap_values
+    
+    meta = orjson.loads((artifact_path / "shap_meta.json").read_bytes())
+    
+    with np.load(shap_path) as arrays:
+        shap_values = shap.Explanation(
+            values=arrays['values'],
+            base_values=arrays['base'],
+            data=arrays['data'],
+            feature_names=meta['feature_names']
+        )
     
     logger.info("shap_values_loaded", path=str(shap_path))
     
@@ -179,12 +258,9 @@ def explain_prediction(
         Dictionary mapping feature names to SHAP contributions
     """
     shap_values = explainer(X_single)
+    values = np.asarray(shap_values.values[0], dtype=np.float64)
     
-    contributions = {}
-    for i, feature in enumerate(feature_names):
-        contributions[feature] = float(shap_values.values[0, i])
-    
-    # Sort by absolute contribution
-    contributions = dict(sorted(contributions.items(), key=lambda x: abs(x[1]), reverse=True))
+    # Sort by absolute contribution (stable, so ties keep feature order)
+    order = np.argsort(-np.abs(values), kind='stable')
     
-    return contributions
+    return dict(zip(np.asarray(feature_names)[order].tolist(), values[order].tolist()))
@@ -8,11 +8,16 @@ Author: NEXUS-AI Team
 
 from typing import Tuple, Dict, Any, Optional
 from pathlib import Path
+import heapq
+from operator import itemgetter
+import os
+import shutil
 import pickle
 import json
+import orjson
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedShuffleSplit
 import xgboost as xgb
 
 from app.core.config import settings
@@ -21,6 +26,48 @@ from ml_engine.training.feature_engineering import get_feature_columns
 
 logger = get_logger("train_xgb")
 
+# Same layout as json.dump(indent=2), with numpy scalars accepted as-is
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _detect_xgb_device() -> str:
+    """
+    Resolve settings.XGB_DEVICE; 'auto' picks CUDA when this XGBoost build
+    supports it and an NVIDIA driver is present, otherwise CPU.
+    """
+    if settings.XGB_DEVICE != 'auto':
+        return settings.XGB_DEVICE
+    if not xgb.build_info().get('USE_CUDA', False):
+        return 'cpu'
+    if os.environ.get('CUDA_VISIBLE_DEVICES') in ('', '-1'):
+        return 'cpu'
+    return 'cuda' if shutil.which('nvidia-smi') else 'cpu'
+
+
+_XGB_DEVICE = _detect_xgb_device()
+
+
+def _float32_features(X: pd.DataFrame) -> pd.DataFrame:
+    """Downcast float64 feature columns to float32, the width XGBoost bins in."""
+    float64_cols = X.columns[X.dtypes == np.float64]
+    if len(float64_cols) == 0:
+        return X
+    return X.astype({col: np.float32 for col in float64_cols})
+
+
+def _count_positive(y) -> int:
+    """
+    Count positive labels straight from the backing array of y.
+    
+    Raises:
+        ValueError: If y holds anything other than 0/1 labels (NaN included)
+    """
+    values = np.asarray(y)
+    pos = np.count_nonzero(values == 1)
+    if pos + np.count_nonzero(values == 0) != values.size:
+        raise ValueError("Labels must be binary 0/1; found NaN or other values")
+    return int(pos)
+
 
 def prepare_train_test_split(
     df: pd.DataFrame,
@@ -54,8 +101,8 @@ def prepare_train_test_split(
     # Get feature columns
     feature_cols = get_feature_columns(df)
     
-    # Target is 'label'
-    X = df[feature_cols]
+    # Target is 'label' (column selection is a lazy copy under copy-on-write)
+    X = df.loc[:, feature_cols]
     y = df['label']
     
     if method == 'time_series':
@@ -68,39 +115,42 @@ def prepare_train_test_split(
         y_train = y.iloc[:split_idx]
         y_test = y.iloc[split_idx:]
         
+        # Positional reads on the backing array (no indexer, no copy)
+        timestamps = df['timestamp'].array
         logger.info(
             "time_series_split",
-            train_start=df['timestamp'].iloc[0],
-            train_end=df['timestamp'].iloc[split_idx-1],
-            test_start=df['timestamp'].iloc[split_idx],
-            test_end=df['timestamp'].iloc[-1]
+            train_start=timestamps[0],
+            train_end=timestamps[split_idx-1],
+            test_start=timestamps[split_idx],
+            test_end=timestamps[-1]
         )
     
     elif method == 'random':
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y,
-            test_size=test_size,
-            random_state=42,
-            stratify=y
-        )
+        # Stratification only needs the labels, so split row positions
+        # rather than handing the splitter the whole feature matrix
+        splitter = StratifiedShuffleSplit(n_splits=1, test_size=test_size, random_state=42)
+        train_idx, test_idx = next(splitter.split(np.zeros(len(y)), y.to_numpy()))
+        
+        X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
+        y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
         logger.info("random_split", stratified=True)
     
     else:
         raise ValueError(f"Unknown split method: {method}")
     
-    # Log class distribution
-    train_pos = y_train.sum()
+    # Log class distribution (one reduction per split, on the raw arrays)
+    train_pos = _count_positive(y_train)
     train_neg = len(y_train) - train_pos
-    test_pos = y_test.sum()
+    test_pos = _count_positive(y_test)
     test_neg = len(y_test) - test_pos
     
     logger.info(
         "class_distribution",
-        train_positive=int(train_pos),
-        train_negative=int(train_neg),
+        train_positive=train_pos,
+        train_negative=train_neg,
         train_ratio=round(train_pos / len(y_train), 3),
-        test_positive=int(test_pos),
-        test_negative=int(test_neg),
+        test_positive=test_pos,
+        test_negative=test_neg,
         test_ratio=round(test_pos / len(y_test), 3)
     )
     
@@ -112,7 +162,8 @@ def train_xgboost_model(
     y_train: pd.Series,
     X_val: Optional[pd.DataFrame] = None,
     y_val: Optional[pd.Series] = None,
-    params: Optional[Dict[str, Any]] = None
+    params: Optional[Dict[str, Any]] = None,
+    class_stats: Optional[Dict[str, int]] = None
 ) -> xgb.XGBClassifier:
     """
     Train XGBoost binary classifier with recall optimization.
@@ -122,7 +173,10 @@ def train_xgboost_model(
         y_train: Training labels
         X_val: Optional validation features (for early stopping)
         y_val: Optional validation labels
-        params: Optional custom hyperparameters
+        params: Optional custom hyperparameters (a scale_pos_weight here
+            overrides the class-ratio weight)
+        class_stats: Optional precomputed label counts of y_train,
+            {'positive': ..., 'total': ...}, so they needn't be counted again
     
     Returns:
         Trained XGBoost model
@@ -132,6 +186,12 @@ def train_xgboost_model(
     """
     logger.info("training_xgboost_model", train_samples=len(X_train))
     
+    # XGBoost would narrow float64 itself; doing it here halves what the
+    # matrix construction reads (integer features are left as they are)
+    X_train = _float32_features(X_train)
+    if X_val is not None:
+        X_val = _float32_features(X_val)
+    
     # Default hyperparameters (conservative for stability)
     if params is None:
         params = {
@@ -143,15 +203,39 @@ def train_xgboost_model(
             'objective': 'binary:logistic',
             'eval_metric': 'logloss',
             'random_state': 42,
-            'n_jobs': -1
+            'tree_method': 'hist',
+            'device': _XGB_DEVICE
         }
-    
-    # Handle class imbalance
-    pos_count = y_train.sum()
+    else:
+        # Local copy: the thread cap and class weight filled in below must
+        # not leak into a dict the caller reuses for the next split or fold
+        params = dict(params)
+    
+    if params.get('device', 'cpu') == 'cpu' and params.get('n_jobs') in (None, -1):
+        # Host threads only matter for CPU hist (ignored on CUDA). Past ~8
+        # threads the per-node histogram reduction contends more than it
+        # parallelizes, so cap rather than take every core (custom params
+        # asking for "all cores" get the same cap, on the local copy only)
+        params['n_jobs'] = settings.XGB_N_JOBS or min(8, os.cpu_count() or 1)
+    
+    # Handle class imbalance (caller's counts must describe these labels)
+    if class_stats is not None:
+        if class_stats['total'] != len(y_train):
+            raise ValueError(
+                f"class_stats total {class_stats['total']} does not match "
+                f"{len(y_train)} training labels"
+            )
+        pos_count = class_stats['positive']
+    else:
+        pos_count = _count_positive(y_train)
     neg_count = len(y_train) - pos_count
-    scale_pos_weight = neg_count / pos_count if pos_count > 0 else 1.0
     
-    params['scale_pos_weight'] = scale_pos_weight
+    # A caller-supplied weight wins; otherwise use the negative/positive ratio
+    if 'scale_pos_weight' in params:
+        scale_pos_weight = params['scale_pos_weight']
+    else:
+        scale_pos_weight = neg_count / pos_count if pos_count > 0 else 1.0
+        params['scale_pos_weight'] = scale_pos_weight
     
     logger.info(
         "class_imbalance_handling",
@@ -163,26 +247,52 @@ def train_xgboost_model(
     # Initialize model
     model = xgb.XGBClassifier(**params)
     
+    # Quantize the features once; the validation matrix reuses the training
+    # bins (ref=) rather than being sketched again
+    dtrain = xgb.QuantileDMatrix(
+        X_train, label=y_train, nthread=model.n_jobs, max_bin=model.max_bin
+    )
+    
     # Prepare evaluation set for early stopping
-    eval_set = []
+    evals = []
     if X_val is not None and y_val is not None:
-        eval_set = [(X_val, y_val)]
-    
-    # Train
-    if eval_set:
-        model.fit(
-            X_train, y_train,
-            eval_set=eval_set,
-            verbose=False
+        evals = [(
+            xgb.QuantileDMatrix(X_val, label=y_val, ref=dtrain, max_bin=model.max_bin),
+            'validation_0'
+        )]
+    
+    # Train on the matrices directly, then load the booster into the
+    # classifier so callers and saved artifacts keep the sklearn interface
+    evals_result = {}
+    booster = xgb.train(
+        model.get_xgb_params(),
+        dtrain,
+        num_boost_round=model.get_num_boosting_rounds(),
+        evals=evals,
+        evals_result=evals_result,
+        early_stopping_rounds=model.early_stopping_rounds if evals else None,
+        verbose_eval=False
+    )
+    model.load_model(bytearray(booster.save_raw()))
+    
+    if evals:
+        model.evals_result_ = evals_result
+        logger.info(
+            "training_complete_with_early_stopping",
+            best_iteration=booster.attr('best_iteration'),
+            rounds=booster.num_boosted_rounds()
         )
-        logger.info("training_complete_with_early_stopping")
     else:
-        model.fit(X_train, y_train, verbose=False)
         logger.info("training_complete")
     
+    if model.get_params().get('device', 'cpu') != 'cpu':
+        # Saved artifacts are served from CPU hosts; predict there without
+        # the GPU-to-CPU fallback warning on every call
+        model.set_params(device='cpu')
+    
     # Log feature importance
     feature_importance = dict(zip(X_train.columns, model.feature_importances_))
-    top_features = sorted(feature_importance.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_features = heapq.nlargest(5, feature_importance.items(), key=itemgetter(1))
     
     logger.info(
         "top_features",
@@ -221,27 +331,28 @@ def save_model_artifacts(
     # 1. Save model
     model_path = output_path / "xgb_model.pkl"
     with open(model_path, 'wb') as f:
-        pickle.dump(model, f)
+        pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
     logger.info("model_saved", path=str(model_path))
     
     # 2. Save feature metadata
+    # Importances come from the trees themselves, so they are right for any
+    # model however it was loaded; orjson writes the float32 values directly
     feature_importance = dict(zip(feature_names, model.feature_importances_))
+    
     feature_metadata = {
         "features": feature_names,
-        "feature_importance": {k: float(v) for k, v in feature_importance.items()},
+        "feature_importance": feature_importance,
         "num_features": len(feature_names)
     }
     
     features_path = output_path / "feature_list.json"
-    with open(features_path, 'w') as f:
-        json.dump(feature_metadata, f, indent=2)
+    features_path.write_bytes(orjson.dumps(feature_metadata, option=_ORJSON_OPTIONS))
     logger.info("features_saved", path=str(features_path), num_features=len(feature_names))
     
     # 3. Save thresholds if provided
     if thresholds:
         thresholds_path = output_path / "thresholds.json"
-        with open(thresholds_path, 'w') as f:
-            json.dump(thresholds, f, indent=2)
+        thresholds_path.write_bytes(orjson.dumps(thresholds, option=_ORJSON_OPTIONS))
         logger.info("thresholds_saved", path=str(thresholds_path))
 
 
@@ -265,7 +376,7 @@ def load_model_artifacts(
     # Load model
     model_path = artifact_path / "xgb_model.pkl"
     with open(model_path, 'rb') as f:
-        model = pickle.load(f)
+        model = pickle.loads(f.read())
     logger.info("model_loaded", path=str(model_path))
     
     # Load features
@@ -150,60 +150,70 @@ def test_alert_api():
     print("TEST 3: Alert API Endpoints")
     print("="*60)
     
-    from fastapi.testclient import TestClient
+    import asyncio
+    from httpx import ASGITransport, AsyncClient
     from app.main import app
     
-    client = TestClient(app)
+    async def call_endpoints():
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            # The reads don't depend on each other, so issue them concurrently
+            active, check = await asyncio.gather(
+                client.get("/api/v1/alerts/active"),
+                client.get("/api/v1/alerts/check?lat=26.2&lon=91.7"),
+            )
+            # The generators write alert state, so run them one after another
+            flood = await client.post(
+                "/api/v1/alerts/generate/flood",
+                json={
+                    "station_id": "TEST_STATION",
+                    "center_lat": 26.3,
+                    "center_lon": 91.8,
+                    "probability": 0.8,
+                    "risk_level": "HIGH",
+                    "lead_time_hours": 6
+                }
+            )
+            landslide = await client.post(
+                "/api/v1/alerts/generate/landslide",
+                json={
+                    "lat": 26.6,
+                    "lon": 92.1,
+                    "susceptibility": 0.7,
+                    "risk_level": "HIGH"
+                }
+            )
+            return active, check, flood, landslide
+    
+    active, check, flood, landslide = asyncio.run(call_endpoints())
     
     # Test active alerts
     print("\nTesting GET /alerts/active...")
-    response = client.get("/api/v1/alerts/active")
-    print(f"  Status: {response.status_code}")
-    data = response.json()
+    print(f"  Status: {active.status_code}")
+    data = active.json()
     print(f"  Alert count: {data.get('count', 0)}")
     
     # Test zone check
     print("\nTesting GET /alerts/check...")
-    response = client.get("/api/v1/alerts/check?lat=26.2&lon=91.7")
-    print(f"  Status: {response.status_code}")
-    data = response.json()
+    print(f"  Status: {check.status_code}")
+    data = check.json()
     print(f"  Location status: {data.get('status')}")
     print(f"  Max severity: {data.get('max_severity')}")
     
     # Test flood alert generation
     print("\nTesting POST /alerts/generate/flood...")
-    response = client.post(
-        "/api/v1/alerts/generate/flood",
-        json={
-            "station_id": "TEST_STATION",
-            "center_lat": 26.3,
-            "center_lon": 91.8,
-            "probability": 0.8,
-            "risk_level": "HIGH",
-            "lead_time_hours": 6
-        }
-    )
-    print(f"  Status: {response.status_code}")
-    if response.status_code == 200:
-        data = response.json()
+    print(f"  Status: {flood.status_code}")
+    if flood.status_code == 200:
+        data = flood.json()
         alert = data.get("alert", {})
         print(f"  Alert type: {alert.get('alert_type')}")
         print(f"  Severity: {alert.get('severity')}")
     
     # Test landslide alert generation
     print("\nTesting POST /alerts/generate/landslide...")
-    response = client.post(
-        "/api/v1/alerts/generate/landslide",
-        json={
-            "lat": 26.6,
-            "lon": 92.1,
-            "susceptibility": 0.7,
-            "risk_level": "HIGH"
-        }
-    )
-    print(f"  Status: {response.status_code}")
-    if response.status_code == 200:
-        data = response.json()
+    print(f"  Status: {landslide.status_code}")
+    if landslide.status_code == 200:
+        data = landslide.json()
         alert = data.get("alert", {})
         print(f"  Alert type: {alert.get('alert_type')}")
     
@@ -30,7 +30,8 @@ from ml_engine.training.train_xgb import (
 from ml_engine.training.evaluation import (
     evaluate_model,
     find_optimal_threshold,
-    compute_lead_time_analysis
+    compute_lead_time_analysis,
+    predict_positive_proba
 )
 from ml_engine.training.shap_analysis import (
     compute_shap_values,
@@ -151,13 +152,17 @@ def test_model_evaluation(model, X_test, y_test, df_features):
     print("TEST 4: Model Evaluation")
     print("="*60)
     
+    # Predict once; the threshold sweep, evaluation and lead time share it
+    y_proba = predict_positive_proba(model, X_test)
+    
     # Find optimal threshold
     print("\nFinding optimal threshold (F2-score)...")
     optimal_threshold, f2_score = find_optimal_threshold(
         model,
         X_test,
         y_test,
-        metric='f2'
+        metric='f2',
+        y_proba=y_proba
     )
     
     print(f"\nOptimal threshold: {optimal_threshold:.2f}")
@@ -165,7 +170,7 @@ def test_model_evaluation(model, X_test, y_test, df_features):
     
     # Evaluate at optimal threshold
     print("\nEvaluating model...")
-    metrics = evaluate_model(model, X_test, y_test, threshold=optimal_threshold)
+    metrics = evaluate_model(model, X_test, y_test, threshold=optimal_threshold, y_proba=y_proba)
     
     print(f"\n[OK] Model evaluated")
     print(f"\nMetrics:")
@@ -182,12 +187,12 @@ def test_model_evaluation(model, X_test, y_test, df_features):
     
     # Lead time analysis
     test_df = df_features.iloc[len(df_features) - len(X_test):]
-    y_pred = model.predict_proba(X_test)[:, 1] >= optimal_threshold
+    y_pred = y_proba >= optimal_threshold
     
     lead_time_stats = compute_lead_time_analysis(
         test_df.reset_index(drop=True),
-        y_pred.astype(int),
-        model.predict_proba(X_test)[:, 1]
+        y_pred.view(np.int8),
+        y_proba
     )
     
     if lead_time_stats:
@@ -209,15 +214,15 @@ def test_shap_explainability(model, X_train, X_test):
     print("TEST 5: SHAP Explainability")
     print("="*60)
     
-    # Sample background data (for efficiency)
-    X_background = X_train.sample(min(100, len(X_train)), random_state=42)
-    X_explain = X_test.sample(min(50, len(X_test)), random_state=42)
+    # Sample rows to explain (for efficiency); tree_path_dependent SHAP
+    # reads coverage from the trees, so no background sample is needed
+    rng = np.random.default_rng(42)
+    X_explain = X_test.iloc[rng.choice(len(X_test), size=min(50, len(X_test)), replace=False)]
     
     print(f"\nComputing SHAP values...")
-    print(f"  Background: {len(X_background)} samples")
     print(f"  Explain: {len(X_explain)} samples")
     
-    shap_values, explainer = compute_shap_values(model, X_background, X_explain)
+    shap_values, explainer = compute_shap_values(model, X_explain=X_explain)
     
     print(f"\n[OK] SHAP values computed")
     
@@ -270,13 +275,15 @@ def test_save_artifacts(model, feature_names, metrics, optimal_threshold, shap_v
     assert (artifacts_dir / "xgb_model.pkl").exists(), "Model file not saved"
     assert (artifacts_dir / "feature_list.json").exists(), "Features file not saved"
     assert (artifacts_dir / "thresholds.json").exists(), "Thresholds file not saved"
-    assert (artifacts_dir / "shap_values.pkl").exists(), "SHAP file not saved"
+    assert (artifacts_dir / "shap_values.npz").exists(), "SHAP file not saved"
+    assert (artifacts_dir / "shap_meta.json").exists(), "SHAP metadata not saved"
     
     print("\nAll artifact files exist:")
     print("  [OK] xgb_model.pkl")
     print("  [OK] feature_list.json")
     print("  [OK] thresholds.json")
-    print("  [OK] shap_values.pkl")
+    print("  [OK] shap_values.npz")
+    print("  [OK] shap_meta.json")
     
     print("\n[PASS] Save artifacts")
 
@@ -14,11 +14,12 @@ Uses real Assam catchment from previous tasks.
 Author: NEXUS-AI Team
 """
 
+import os
 import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import date, timedelta
-import pandas as pd
-import numpy as np
 
 # Add app to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -30,18 +31,47 @@ from app.modules.environmental.tasks.etl import (
     sanitize_timeseries,
     _generate_sampling_points
 )
-from app.modules.geospatial.hydrology.catchment import catchment_to_polygon
 from app.core.logging import configure_logger
 
 # Configure logging
 configure_logger()
 
+_BAR = "=" * 60
+
+# Shared Assam test catchments (Guwahati area), built once per module
+ASSAM_TEST_CATCHMENT_SMALL = {
+    "type": "Polygon",
+    "coordinates": [[
+        [91.5, 26.0],
+        [91.7, 26.0],
+        [91.7, 26.2],
+        [91.5, 26.2],
+        [91.5, 26.0]
+    ]]
+}
+
+# Smaller variant used by the caching test
+ASSAM_TEST_CATCHMENT_TINY = {
+    "type": "Polygon",
+    "coordinates": [[
+        [91.5, 26.0],
+        [91.6, 26.0],
+        [91.6, 26.1],
+        [91.5, 26.1],
+        [91.5, 26.0]
+    ]]
+}
+
+# Test 2 window: monsoon season in Assam
+HISTORICAL_START = date(2024, 6, 1)
+HISTORICAL_END = date(2024, 6, 7)
+
 
 def test_catchment_sampling():
     """Test 1: Catchment Sampling Strategy"""
-    print("\n" + "="*60)
+    print(f"\n{_BAR}")
     print("TEST 1: Catchment Sampling Strategy")
-    print("="*60)
+    print(_BAR)
     
     # Small catchment (< 100 km²)
     small_catchment = {
@@ -55,12 +85,6 @@ def test_catchment_sampling():
         ]]
     }
     
-    points = _generate_sampling_points(small_catchment)
-    print(f"\n[Small Catchment] Sampling points: {len(points)}")
-    assert len(points) == 1, "Small catchment should have 1 point"
-    print(f"  Centroid: {points[0]}")
-    print("[PASS] Small catchment sampling")
-    
     # Medium catchment (100-1000 km²)
     # ~0.3° x 0.3° ≈ 900 km² at 26°N
     medium_catchment = {
@@ -74,12 +98,6 @@ def test_catchment_sampling():
         ]]
     }
     
-    points = _generate_sampling_points(medium_catchment)
-    print(f"\n[Medium Catchment] Sampling points: {len(points)}")
-    assert 1 <= len(points) <= 5, f"Medium catchment should have 1-5 points, got {len(points)}"
-    print(f"  Points: {points[:3]}...")  # Show first 3
-    print("[PASS] Medium catchment sampling")
-    
     # Large catchment (> 1000 km²)
     # ~2° x 2° ≈ 40,000 km² at 26°N
     large_catchment = {
@@ -93,44 +111,64 @@ def test_catchment_sampling():
         ]]
     }
     
-    points = _generate_sampling_points(large_catchment)
-    print(f"\n[Large Catchment] Sampling points: {len(points)}")
-    assert 1 <= len(points) <= 10, f"Large catchment should have 1-10 points, got {len(points)}"
-    print(f"  Points: {points[:3]}...")  # Show first 3
-    print("[PASS] Large catchment sampling")
+    # (catchment, min points, max points, label)
+    cases = [
+        (small_catchment, 1, 1, "Small"),
+        (medium_catchment, 1, 5, "Medium"),
+        (large_catchment, 1, 10, "Large"),
+    ]
+    
+    # Sampling is independent per polygon, so run the three cases concurrently
+    with ThreadPoolExecutor(max_workers=len(cases)) as executor:
+        results = list(executor.map(_generate_sampling_points, [c for c, _, _, _ in cases]))
+    
+    for (_, lo, hi, label), points in zip(cases, results):
+        print(f"\n[{label} Catchment] Sampling points: {len(points)}")
+        assert lo <= len(points) <= hi, f"{label} catchment should have {lo}-{hi} points, got {len(points)}"
+        print(f"  Points: {points[:3]}...")  # Show first 3
+        print(f"[PASS] {label.lower()} catchment sampling")
 
 
-def test_historical_weather():
+def _fetch_historical():
+    """Fetch the Test 2 window: 7 monsoon days over an Assam catchment."""
+    return fetch_historical_weather(
+        ASSAM_TEST_CATCHMENT_SMALL,
+        HISTORICAL_START,
+        HISTORICAL_END,
+        variables=['precipitation', 'temperature_2m']
+    )
+
+
+def _fetch_forecast():
+    """Fetch the Test 3 window: 7-day forecast over an Assam catchment."""
+    return fetch_forecast_weather(
+        ASSAM_TEST_CATCHMENT_SMALL,
+        horizon_days=7,
+        variables=['precipitation']
+    )
+
+
+def _fetch_both():
+    """Run the historical and forecast fetches concurrently (independent endpoints)."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        historical = executor.submit(_fetch_historical)
+        forecast = executor.submit(_fetch_forecast)
+        return historical.result(), forecast.result()
+
+
+def test_historical_weather(df=None):
     """Test 2: Historical Weather Fetching"""
-    print("\n" + "="*60)
-    print("TEST 2: Historical Weather Fetching (ERA5)")
-    print("="*60)
-    
-    # Use Assam catchment
-    catchment = {
-        "type": "Polygon",
-        "coordinates": [[
-            [91.5, 26.0],
-            [91.7, 26.0],
-            [91.7, 26.2],
-            [91.5, 26.2],
-            [91.5, 26.0]
-        ]]
-    }
+    import pandas as pd
     
-    # Fetch 7 days of historical data
-    start_date = date(2024, 6, 1)  # Monsoon season in Assam
-    end_date = date(2024, 6, 7)
+    print(f"\n{_BAR}")
+    print("TEST 2: Historical Weather Fetching (ERA5)")
+    print(_BAR)
     
-    print(f"\nFetching historical data: {start_date} to {end_date}")
+    print(f"\nFetching historical data: {HISTORICAL_START} to {HISTORICAL_END}")
     print("Variables: precipitation, temperature_2m")
     
-    df = fetch_historical_weather(
-        catchment,
-        start_date,
-        end_date,
-        variables=['precipitation', 'temperature_2m']
-    )
+    if df is None:
+        df = _fetch_historical()
     
     print(f"\n[OK] Data fetched: {len(df)} rows")
     print(f"\nFirst 5 rows:")
@@ -156,32 +194,19 @@ def test_historical_weather():
     return df
 
 
-def test_forecast_weather():
+def test_forecast_weather(df=None):
     """Test 3: Forecast Weather Fetching"""
-    print("\n" + "="*60)
-    print("TEST 3: Forecast Weather Fetching (GFS)")
-    print("="*60)
+    import pandas as pd
     
-    # Use Assam catchment
-    catchment = {
-        "type": "Polygon",
-        "coordinates": [[
-            [91.5, 26.0],
-            [91.7, 26.0],
-            [91.7, 26.2],
-            [91.5, 26.2],
-            [91.5, 26.0]
-        ]]
-    }
+    print(f"\n{_BAR}")
+    print("TEST 3: Forecast Weather Fetching (GFS)")
+    print(_BAR)
     
     print(f"\nFetching 7-day forecast")
     print("Variables: precipitation")
     
-    df = fetch_forecast_weather(
-        catchment,
-        horizon_days=7,
-        variables=['precipitation']
-    )
+    if df is None:
+        df = _fetch_forecast()
     
     print(f"\n[OK] Forecast fetched: {len(df)} rows")
     print(f"\nFirst 5 rows:")
@@ -196,10 +221,6 @@ def test_forecast_weather():
     first_timestamp = df['timestamp'].iloc[0]
     print(f"\nForecast starts: {first_timestamp}")
     
-    # Ensure first_timestamp is timezone-aware for comparison if it's not
-    if first_timestamp.tzinfo is None:
-        first_timestamp = first_timestamp.tz_localize('UTC')
-        
     # Allow up to 48 hours in the past to account for timezones and model run delays
     # (Forecasts usually start at 00:00 UTC of the current or previous day)
     threshold = pd.Timestamp.now(tz='UTC') - pd.Timedelta(hours=48)
@@ -215,9 +236,9 @@ def test_forecast_weather():
 
 def test_catchment_aggregation(weather_df):
     """Test 4: Catchment Aggregation"""
-    print("\n" + "="*60)
+    print(f"\n{_BAR}")
     print("TEST 4: Catchment Aggregation")
-    print("="*60)
+    print(_BAR)
     
     catchment_id = "assam_test_001"
     
@@ -247,12 +268,15 @@ def test_catchment_aggregation(weather_df):
 
 def test_timeseries_sanitization():
     """Test 5: Time-Series Sanitization"""
-    print("\n" + "="*60)
+    import pandas as pd
+    import numpy as np
+    
+    print(f"\n{_BAR}")
     print("TEST 5: Time-Series Sanitization")
-    print("="*60)
+    print(_BAR)
     
     # Create synthetic time series with gaps and duplicates
-    timestamps = pd.date_range('2024-01-01', periods=100, freq='1h')
+    timestamps = pd.date_range('2024-01-01', periods=100, freq='1h', tz='UTC')
     
     # Remove some timestamps to create gaps
     gaps_to_remove = [10, 11, 12, 50, 51, 52, 53, 54, 55, 56, 57, 58]  # 3-hour and 9-hour gaps
@@ -298,20 +322,9 @@ def test_timeseries_sanitization():
 
 def test_caching():
     """Test 6: Caching Performance"""
-    print("\n" + "="*60)
+    print(f"\n{_BAR}")
     print("TEST 6: Caching Performance")
-    print("="*60)
-    
-    catchment = {
-        "type": "Polygon",
-        "coordinates": [[
-            [91.5, 26.0],
-            [91.6, 26.0],
-            [91.6, 26.1],
-            [91.5, 26.1],
-            [91.5, 26.0]
-        ]]
-    }
+    print(_BAR)
     
     start_date = date(2024, 5, 1)
     end_date = date(2024, 5, 3)
@@ -320,7 +333,7 @@ def test_caching():
     import time
     start_time = time.time()
     
-    df1 = fetch_historical_weather(catchment, start_date, end_date)
+    df1 = fetch_historical_weather(ASSAM_TEST_CATCHMENT_TINY, start_date, end_date)
     
     first_duration = time.time() - start_time
     print(f"  Duration: {first_duration:.2f}s")
@@ -329,7 +342,7 @@ def test_caching():
     print(f"\nSecond fetch (should hit cache):")
     start_time = time.time()
     
-    df2 = fetch_historical_weather(catchment, start_date, end_date)
+    df2 = fetch_historical_weather(ASSAM_TEST_CATCHMENT_TINY, start_date, end_date)
     
     second_duration = time.time() - start_time
     print(f"  Duration: {second_duration:.2f}s")
@@ -347,19 +360,22 @@ def test_caching():
 
 def main():
     """Run all tests"""
-    print("="*60)
+    print(_BAR)
     print("WEATHER ETL PIPELINE TEST SUITE")
-    print("="*60)
+    print(_BAR)
     
     try:
         # Test 1: Sampling
         test_catchment_sampling()
         
+        # Tests 2 & 3 hit independent endpoints, so fetch both concurrently
+        historical_raw, forecast_raw = _fetch_both()
+        
         # Test 2: Historical weather
-        historical_df = test_historical_weather()
+        historical_df = test_historical_weather(historical_raw)
         
         # Test 3: Forecast weather
-        forecast_df = test_forecast_weather()
+        forecast_df = test_forecast_weather(forecast_raw)
         
         # Test 4: Aggregation
         aggregated_df = test_catchment_aggregation(historical_df)
@@ -371,9 +387,9 @@ def main():
         test_caching()
         
         # Summary
-        print("\n" + "="*60)
+        print(f"\n{_BAR}")
         print("[PASS] ALL TESTS PASSED")
-        print("="*60)
+        print(_BAR)
         
         print("\nKey Validations:")
         print("  [OK] Catchment sampling strategy working")
@@ -392,8 +408,8 @@ def main():
         
     except Exception as e:
         print(f"\n[FAIL] TEST FAILED: {e}")
-        import traceback
-        traceback.print_exc()
+        if os.environ.get("NEXUS_VERBOSE"):
+            traceback.print_exc()
         return 1
     
     return 0